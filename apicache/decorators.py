@@ -0,0 +1,89 @@
+from functools import wraps
+
+from django.core.cache import cache
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from metrics.instruments import CACHE_REQUESTS
+from . import services
+
+
+def _view_request(args):
+    return args[1] if isinstance(args[0], APIView) else args[0]
+
+
+def cached_response(name):
+    """
+    Cache the 200 responses of a read-only API view per user, keyed on the
+    user's data version and the query string.
+
+    Works on @api_view functions (place it below @permission_classes) and on
+    ViewSet actions. Concurrent misses for the same key compute once: the
+    first request takes a lock and the rest wait for its result.
+    The X-Cache response header reports HIT or MISS.
+    """
+    services.CACHED_VIEWS.append(name)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            request = _view_request(args)
+            if not request.user.is_authenticated:
+                return view(*args, **kwargs)
+
+            key = services.response_key(name, request)
+            data = cache.get(key)
+
+            if data is None:
+                with services.single_flight(key) as leader:
+                    if not leader:
+                        data = services.wait_for(key)
+                    if data is None:
+                        response = view(*args, **kwargs)
+                        if response.status_code == 200:
+                            cache.set(key, response.data, services.get_timeout())
+                        services.record(name, "miss")
+                        response["X-Cache"] = "MISS"
+                        return response
+
+            services.record(name, "hit")
+            return Response(data, headers={"X-Cache": "HIT"})
+        return wrapper
+    return decorator
+
+
+def etag_response(name):
+    """
+    Conditional GET for a read-only API view: 200 responses carry a strong
+    ETag derived from the user's data version, and a request whose
+    If-None-Match matches is answered with 304 before the view runs, so no
+    query, aggregation or serialization happens.
+
+    Place it above @cached_response when both are used.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            request = _view_request(args)
+            if not request.user.is_authenticated:
+                return view(*args, **kwargs)
+
+            etag = services.response_etag(name, request)
+            headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept, Authorization"}
+
+            if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+            if if_none_match:
+                tags = [tag.removeprefix("W/") for tag in parse_etags(if_none_match)]
+                if etag in tags or "*" in tags:
+                    CACHE_REQUESTS.inc(cache="etag", view=name, outcome="hit")
+                    return Response(status=304, headers=headers)
+
+            CACHE_REQUESTS.inc(cache="etag", view=name, outcome="miss")
+            response = view(*args, **kwargs)
+            if response.status_code == 200:
+                for header, value in headers.items():
+                    response[header] = value
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,172 @@
+import hashlib
+import time
+from contextlib import contextmanager
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from metrics.instruments import CACHE_REQUESTS
+
+GLOBAL_SCOPE = "global"
+LOCK_TIMEOUT = 30      # seconds a computing request may hold the single-flight lock
+LOCK_WAIT = 5          # seconds a follower waits for the leader's result
+LOCK_POLL = 0.05
+
+# Names of every view wrapped with @cached_response, for the stats endpoint.
+CACHED_VIEWS = []
+
+
+# --- Data versions -----------------------------------------------------------
+#
+# Every cached entry is keyed on the owner's data version plus a global version
+# (categories are shared by all users). Writes bump the version instead of
+# deleting keys, so stale entries are simply never read again and expire.
+
+def version_key(scope):
+    return f"apicache:version:{scope}"
+
+
+def _seed(key):
+    # Seed from the clock so a version lost to eviction never repeats an old one.
+    cache.add(key, time.time_ns() // 1000, timeout=None)
+    return cache.get(key)
+
+
+def bump_version(scope):
+    key = version_key(scope)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        return _seed(key)
+
+
+def data_version(user_id):
+    """
+    "<user version>.<global version>" for one user; changes whenever any of the
+    user's expenses, incomes or budgets (or any category) change.
+    """
+    keys = [version_key(user_id), version_key(GLOBAL_SCOPE)]
+    versions = cache.get_many(keys)
+    return ".".join(str(versions.get(key) or _seed(key)) for key in keys)
+
+
+def invalidate_user(user_id):
+    """
+    Bump the user's data version once the current transaction commits, so a
+    concurrent reader never caches pre-commit data under the new version.
+    """
+    transaction.on_commit(lambda: bump_version(user_id))
+
+
+def invalidate_all():
+    transaction.on_commit(lambda: bump_version(GLOBAL_SCOPE))
+
+
+# --- Entries -----------------------------------------------------------------
+
+def get_timeout():
+    return getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+
+
+def request_version(request):
+    """
+    data_version() of the requesting user, looked up once per request.
+    """
+    if not hasattr(request, "_data_version"):
+        request._data_version = data_version(request.user.id)
+    return request._data_version
+
+
+def fingerprint(name, request):
+    """
+    Identifies the response of one view for one user, data version and query
+    string. Today's date is included because the views default to the
+    current month.
+    """
+    params = request.query_params
+    query = "&".join(f"{key}={value}" for key in sorted(params) for value in params.getlist(key))
+    digest = hashlib.sha1(query.encode("utf-8")).hexdigest()
+    return f"{name}:{request.user.id}:{request_version(request)}:{date.today().isoformat()}:{digest}"
+
+
+def response_key(name, request):
+    return f"apicache:response:{fingerprint(name, request)}"
+
+
+def response_etag(name, request):
+    """
+    Strong ETag for a response. The Accept header is included so JSON and the
+    browsable API never share a tag.
+    """
+    raw = f"{fingerprint(name, request)}:{request.META.get('HTTP_ACCEPT', '')}"
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+@contextmanager
+def single_flight(key):
+    """
+    Yields True for the one caller that should compute `key`; others get False
+    and should wait_for() the leader's result.
+    """
+    lock = f"{key}:lock"
+    leader = cache.add(lock, 1, LOCK_TIMEOUT)
+    try:
+        yield leader
+    finally:
+        if leader:
+            cache.delete(lock)
+
+
+def wait_for(key):
+    """
+    Poll for a value another request is computing. Returns None if the leader
+    failed or took longer than LOCK_WAIT.
+    """
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if cache.get(f"{key}:lock") is None:
+            return cache.get(key)
+    return None
+
+
+# --- Stats -------------------------------------------------------------------
+
+def stats_key(name, outcome):
+    return f"apicache:stats:{name}:{outcome}"
+
+
+def record(name, outcome):
+    """
+    Count a "hit" or "miss". Counters live in the shared cache so every
+    worker process reports into the same numbers; they are also exported
+    to /api/metrics/.
+    """
+    CACHE_REQUESTS.inc(cache="response", view=name, outcome=outcome)
+    key = stats_key(name, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_stats():
+    keys = [stats_key(name, outcome) for name in CACHED_VIEWS for outcome in ("hit", "miss")]
+    counters = cache.get_many(keys)
+    stats = {}
+    for name in CACHED_VIEWS:
+        hits = counters.get(stats_key(name, "hit"), 0)
+        misses = counters.get(stats_key(name, "miss"), 0)
+        total = hits + misses
+        stats[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 3) if total else None,
+        }
+    return stats
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from budgets.models import Budget, MonthlyBudget
+from categories.models import Category
+from expenses.models import Expense
+from incomes.models import Income
+from .services import invalidate_all, invalidate_user
+
+
+@receiver(post_save, sender=Expense)
+@receiver(post_save, sender=Income)
+@receiver(post_save, sender=Budget)
+@receiver(post_save, sender=MonthlyBudget)
+@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=Income)
+@receiver(post_delete, sender=Budget)
+@receiver(post_delete, sender=MonthlyBudget)
+def invalidate_owner(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_everyone(sender, instance, **kwargs):
+    # Category names appear in every user's summaries.
+    invalidate_all()
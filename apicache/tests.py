@@ -0,0 +1,137 @@
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from budgets.models import Budget
+from categories.models import Category
+from expenses.models import Expense
+from incomes.models import Income
+
+EXPENSE_SUMMARY = "/api/expenses/summary-by-category/?month=2025-03"
+INCOME_SUMMARY = "/api/incomes/summary/?month=2025-03"
+BUDGET_SUMMARY = "/api/budgets/summary/?month=2025-03"
+
+
+class ResponseCacheTests(APITestCase):
+    """
+    @cached_response: a repeated request is served from the cache until one
+    of the user's writes commits, and entries are never shared between users.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+        cls.other = User.objects.create_user(username="other", email="other@example.com", password="password")
+        cls.food = Category.objects.create(name="Food", type="expense")
+        cls.salary = Category.objects.create(name="Salary", type="income")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def fetch(self, path, cache_status):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], cache_status)
+        return response.data
+
+    def add_expense(self, user, amount):
+        return Expense.objects.create(
+            user=user, title="Lunch", amount=amount, date=date(2025, 3, 10), category=self.food,
+        )
+
+    def test_miss_then_hit(self):
+        self.add_expense(self.user, 40)
+        first = self.fetch(EXPENSE_SUMMARY, "MISS")
+        self.assertEqual(self.fetch(EXPENSE_SUMMARY, "HIT"), first)
+        # The query string is part of the key.
+        self.fetch("/api/expenses/summary-by-category/?month=2025-04", "MISS")
+
+    def test_expense_write_invalidates_on_commit(self):
+        self.fetch(EXPENSE_SUMMARY, "MISS")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_expense(self.user, 40)
+            # Not before the write commits.
+            self.fetch(EXPENSE_SUMMARY, "HIT")
+        self.assertEqual(self.fetch(EXPENSE_SUMMARY, "MISS"), [{"category": "Food", "total": 40.0}])
+
+    def test_income_write_invalidates_on_commit(self):
+        self.assertEqual(self.fetch(INCOME_SUMMARY, "MISS"), {"total_income": 0})
+        with self.captureOnCommitCallbacks(execute=True):
+            Income.objects.create(
+                user=self.user, title="Salary", amount=1000, date=date(2025, 3, 1), category=self.salary,
+            )
+        self.assertEqual(self.fetch(INCOME_SUMMARY, "MISS"), {"total_income": 1000.0})
+
+    def test_budget_write_invalidates_on_commit(self):
+        self.assertEqual(len(self.fetch(BUDGET_SUMMARY, "MISS")), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Budget.objects.create(user=self.user, category=self.food, month=date(2025, 3, 1), amount=100)
+        self.assertEqual(len(self.fetch(BUDGET_SUMMARY, "MISS")), 1)
+
+    def test_entries_are_per_user(self):
+        self.add_expense(self.user, 40)
+        self.add_expense(self.other, 75)
+        self.fetch(EXPENSE_SUMMARY, "MISS")
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.fetch(EXPENSE_SUMMARY, "MISS"), [{"category": "Food", "total": 75.0}])
+        self.fetch(EXPENSE_SUMMARY, "HIT")
+
+        # A write by one user leaves the other user's entries in place.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_expense(self.user, 5)
+        self.fetch(EXPENSE_SUMMARY, "HIT")
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.fetch(EXPENSE_SUMMARY, "MISS"), [{"category": "Food", "total": 45.0}])
+
+
+class ETagTests(APITestCase):
+    """
+    @etag_response: a request whose If-None-Match carries the current ETag
+    gets a 304 without running the view; a committed write changes the ETag.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        cls.food = Category.objects.create(name="Food", type="expense")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_matching_etag_returns_304_without_running_the_view(self):
+        response = self.client.get(EXPENSE_SUMMARY)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with mock.patch("rollups.services.category_totals") as category_totals, self.assertNumQueries(0):
+            response = self.client.get(EXPENSE_SUMMARY, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        category_totals.assert_not_called()
+        # Answered above @cached_response too: not even a cache lookup.
+        self.assertNotIn("X-Cache", response)
+
+        # Weak comparison, as in a list of tags sent by a proxy.
+        response = self.client.get(EXPENSE_SUMMARY, HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_changes_the_etag(self):
+        etag = self.client.get(EXPENSE_SUMMARY)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Expense.objects.create(
+                user=self.user, title="Lunch", amount=40, date=date(2025, 3, 10), category=self.food,
+            )
+
+        response = self.client.get(EXPENSE_SUMMARY, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data, [{"category": "Food", "total": 40.0}])
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import CacheStatsView
+
+urlpatterns = [
+    path('stats/', CacheStatsView.as_view(), name='cache-stats'),
+]
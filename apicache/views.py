@@ -0,0 +1,15 @@
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .services import get_stats
+
+
+class CacheStatsView(APIView):
+    """
+    Hit/miss counters of the response cache, per cached view (admin only).
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_stats())
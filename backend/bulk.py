@@ -0,0 +1,184 @@
+from django.conf import settings
+from django.db import connections, transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from apicache.services import invalidate_user
+from categories.registry import get_registry
+from rollups import services as rollups
+from .exports import parse_row_filters
+
+UPDATABLE_FIELDS = ("category_id", "notes")
+
+
+def get_max_ids():
+    return getattr(settings, "BULK_MAX_IDS", 1000)
+
+
+def parse_selection(data):
+    """
+    Filter kwargs for the rows a bulk request targets, from either
+        {"ids": [1, 2, 3]}
+    or
+        {"filter": {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD", "category": <id>}}
+    Raises ValueError with a client-facing message.
+    """
+    ids = data.get("ids")
+    row_filter = data.get("filter")
+
+    if ids is not None:
+        max_ids = get_max_ids()
+        if not isinstance(ids, list) or not ids or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            raise ValueError("'ids' must be a non-empty list of integers.")
+        if len(ids) > max_ids:
+            raise ValueError(f"At most {max_ids} ids can be changed per request; use 'filter' instead.")
+        return {"pk__in": ids}
+
+    if isinstance(row_filter, dict):
+        filters = parse_row_filters(row_filter)
+        if filters:
+            return filters
+
+    raise ValueError("Provide 'ids' or a 'filter' with at least one of start, end, category.")
+
+
+def parse_changes(changes, category_type):
+    """
+    Validate the fields of a bulk update; only category_id and notes may change,
+    and a new category must be of `category_type` ("expense" or "income").
+    """
+    if not isinstance(changes, dict) or not changes:
+        raise ValueError(f"'changes' must be an object with any of: {', '.join(UPDATABLE_FIELDS)}.")
+
+    unknown = set(changes) - set(UPDATABLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Cannot bulk update: {', '.join(sorted(unknown))}.")
+
+    if "category_id" in changes:
+        category_id = changes["category_id"]
+        if not isinstance(category_id, int) or isinstance(category_id, bool) or get_registry().get(category_id) is None:
+            raise ValueError("'category_id' must be the id of an existing category.")
+        if get_registry().get(category_id).type != category_type:
+            raise ValueError(f"'category_id' must be an {category_type} category.")
+
+    if "notes" in changes and not isinstance(changes["notes"], (str, type(None))):
+        raise ValueError("'notes' must be a string or null.")
+
+    return changes
+
+
+def delete_rows(model, ids, using):
+    """
+    Delete the rows with these ids in a single DELETE statement, without the
+    per-row post_delete signals QuerySet.delete() would send. Returns the
+    number of rows deleted.
+    """
+    if not ids:
+        return 0
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders})", ids)
+        return cursor.rowcount
+
+
+class BulkChangeMixin:
+    """
+    Adds bulk-update/ and bulk-delete/ actions to an Expense or Income viewset.
+
+    Each request runs a single UPDATE or DELETE scoped to request.user.
+    Rollup rows are adjusted with one grouped delta pass, and the user's
+    response cache is invalidated once, however many rows change.
+    Per-row model signals are deliberately bypassed.
+    """
+
+    def get_bulk_queryset(self, request):
+        model = self.get_queryset().model
+        return model.objects.filter(user=request.user, **parse_selection(request.data))
+
+    def lock_rows(self, queryset):
+        """
+        Lock the selected rows and return their ids, so the rollup deltas and
+        the UPDATE/DELETE see exactly the same rows. (FOR UPDATE cannot be
+        combined with the grouped rollup query itself.)
+
+        Raises ValueError when a filter selects more than BULK_MAX_IDS rows,
+        the same cap as an explicit id list.
+        """
+        max_ids = get_max_ids()
+        ids = list(queryset.select_for_update().values_list("pk", flat=True)[:max_ids + 1])
+        if len(ids) > max_ids:
+            raise ValueError(f"The filter matches more than {max_ids} rows; narrow it down.")
+        return ids
+
+    def after_bulk_update(self, request, added):
+        """
+        Hook called with the rollup deltas of the rows' new (category, month)
+        groups after a category change.
+        """
+
+    @action(detail=False, methods=['post'], url_path='bulk-update')
+    def bulk_update(self, request):
+        """
+        Body: {"ids": [...]} or {"filter": {...}}, plus
+              {"changes": {"category_id": <id>, "notes": "..."}}
+        Response: {"updated": n}
+        """
+        kind = rollups.kind_for_model(self.get_queryset().model)
+        try:
+            queryset = self.get_bulk_queryset(request)
+            # Rollup kinds and category types share their values ("expense", "income").
+            changes = parse_changes(request.data.get("changes"), category_type=kind)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with transaction.atomic():
+                if "category_id" not in changes:
+                    # Notes do not affect any aggregate.
+                    updated = queryset.update(**changes)
+                else:
+                    # Pinned to ids: a category filter would stop matching the
+                    # rows once the UPDATE has run.
+                    queryset = queryset.model.objects.filter(pk__in=self.lock_rows(queryset))
+                    rollups.record_queryset(kind, queryset, sign=-1)
+                    updated = queryset.update(**changes)
+                    added = rollups.record_queryset(kind, queryset, sign=1)
+                    self.after_bulk_update(request, added)
+                if updated:
+                    invalidate_user(request.user.id)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"updated": updated})
+
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        """
+        Body: {"ids": [...]} or {"filter": {...}}
+        Response: {"deleted": n}
+        """
+        try:
+            queryset = self.get_bulk_queryset(request)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        kind = rollups.kind_for_model(queryset.model)
+        try:
+            with transaction.atomic():
+                ids = self.lock_rows(queryset)
+                rollups.record_queryset(kind, queryset.model.objects.filter(pk__in=ids), sign=-1)
+                # Not queryset.delete(): Expense/Income have post_delete receivers
+                # (rollups, response cache), so Django's collector would load every
+                # row and send a signal per row, subtracting each amount from the
+                # rollups a second time after record_queryset above.
+                deleted = delete_rows(queryset.model, ids, queryset.db)
+                if deleted:
+                    invalidate_user(request.user.id)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"deleted": deleted})
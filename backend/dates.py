@@ -0,0 +1,105 @@
+from datetime import date, datetime
+
+# Upper bound for ?months= / ?from=&to= windows on summary endpoints
+MAX_WINDOW_MONTHS = 60
+
+
+def month_start(value):
+    """
+    First day of the month containing `value` (a date or datetime).
+    """
+    return date(value.year, value.month, 1)
+
+
+def next_month_start(value):
+    """
+    First day of the month following the one containing `value`.
+    """
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+
+def month_range(value):
+    """
+    Half-open [start, end) date range covering the month of `value`.
+    """
+    return month_start(value), next_month_start(value)
+
+
+def month_filter(value, field="date"):
+    """
+    Queryset filter kwargs selecting rows whose `field` falls in the month of `value`.
+
+    Unlike `date__year`/`date__month` (which compile to EXTRACT(...)), a plain
+    range comparison can use the (user, date) composite indexes.
+
+    Example:
+        Expense.objects.filter(user=user, **month_filter(month_start))
+    """
+    start, end = month_range(value)
+    return {f"{field}__gte": start, f"{field}__lt": end}
+
+
+def parse_month(value):
+    """
+    Parse a YYYY-MM string into the first day of that month.
+    Raises ValueError on malformed input.
+    """
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def add_months(value, months):
+    """
+    First day of the month `months` away from the month of `value` (may be negative).
+    """
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def iter_months(first, last):
+    """
+    Yield the first day of every month from `first` to `last`, inclusive.
+    """
+    current = month_start(first)
+    while current <= last:
+        yield current
+        current = next_month_start(current)
+
+
+def month_window(params, today, default_months=6):
+    """
+    Resolve the month window requested by a summary endpoint.
+
+    Accepts either `?months=N` (the N months ending with the month of `today`)
+    or `?from=YYYY-MM&to=YYYY-MM` (inclusive). Returns (first_month, last_month)
+    as month-start dates and raises ValueError with a client-facing message,
+    including for a window longer than MAX_WINDOW_MONTHS in either form.
+    """
+    from_param = params.get("from")
+    to_param = params.get("to")
+
+    if from_param or to_param:
+        if not (from_param and to_param):
+            raise ValueError("Both 'from' and 'to' are required (YYYY-MM).")
+        try:
+            first, last = parse_month(from_param), parse_month(to_param)
+        except ValueError:
+            raise ValueError("Invalid month format. Use YYYY-MM.")
+        if first > last:
+            raise ValueError("'from' must not be after 'to'.")
+    else:
+        try:
+            months = int(params.get("months", default_months))
+        except (TypeError, ValueError):
+            raise ValueError("'months' must be a positive integer.")
+        if months < 1:
+            raise ValueError("'months' must be a positive integer.")
+        if months > MAX_WINDOW_MONTHS:
+            raise ValueError(f"The requested window exceeds {MAX_WINDOW_MONTHS} months.")
+        last = month_start(today)
+        first = add_months(last, -(months - 1))
+
+    if (last.year - first.year) * 12 + last.month - first.month >= MAX_WINDOW_MONTHS:
+        raise ValueError(f"The requested window exceeds {MAX_WINDOW_MONTHS} months.")
+    return first, last
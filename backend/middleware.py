@@ -0,0 +1,172 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("backend.requests")
+slow_logger = logging.getLogger("backend.requests.slow")
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper() hook that records (sql, duration_ms) for
+    every statement, including ones that raise.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - started) * 1000))
+
+    @property
+    def total_ms(self):
+        return sum(duration for _, duration in self.queries)
+
+    @property
+    def slowest(self):
+        return max(self.queries, key=lambda query: query[1], default=(None, 0.0))
+
+
+class RequestTimingMiddleware:
+    """
+    Records, for a sample of requests, the number of SQL queries, total SQL
+    time, the slowest statement, view time and render (serialization) time.
+
+    The numbers are sent back in a Server-Timing header (visible in the
+    browser's network panel) and logged as one JSON line on the
+    "backend.requests" logger. Requests slower than REQUEST_TIMING_SLOW_MS or
+    running more than REQUEST_TIMING_MAX_QUERIES queries also log their full
+    query list on "backend.requests.slow".
+
+    For a streaming response (CSV/NDJSON exports) the log line is written
+    when the body has been sent and includes the queries run while streaming;
+    the Server-Timing header, sent first, does not.
+
+    Disabled (and removed from the middleware chain) unless
+    REQUEST_TIMING_SAMPLE_RATE is above 0; 1.0 instruments every request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "REQUEST_TIMING_SAMPLE_RATE", 0.0)
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.slow_ms = getattr(settings, "REQUEST_TIMING_SLOW_MS", 500)
+        self.max_queries = getattr(settings, "REQUEST_TIMING_MAX_QUERIES", 20)
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        request._timing = {}
+        started = time.perf_counter()
+        with self.record_queries(recorder):
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        timings = self.build_timings(request, recorder, total_ms)
+        response["Server-Timing"] = self.server_timing(timings)
+        if not response.streaming:
+            self.log(request, response, timings, recorder)
+            return response
+
+        # A streamed body (e.g. an export) is produced, and runs its queries,
+        # after the headers are sent: Server-Timing only covers the work up to
+        # the first byte, and the log line is written once the body is done.
+        response["Server-Timing"] += ', body;desc="streamed, not included"'
+        if response.is_async:
+            timings["partial"] = True
+            self.log(request, response, timings, recorder)
+        else:
+            response.streaming_content = self.timed_stream(
+                request, response, response.streaming_content, recorder, started,
+            )
+        return response
+
+    def record_queries(self, recorder):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return stack
+
+    def timed_stream(self, request, response, content, recorder, started):
+        """
+        Yield a streamed body with queries still recorded, then log the
+        request with timings that include the body (also when the client
+        disconnects early and the body is closed).
+        """
+        try:
+            with self.record_queries(recorder):
+                yield from content
+        finally:
+            total_ms = (time.perf_counter() - started) * 1000
+            timings = self.build_timings(request, recorder, total_ms)
+            timings["streamed"] = True
+            self.log(request, response, timings, recorder)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, "_timing"):
+            request._timing["view_start"] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Called after the view returns and just before the response (e.g. a
+        # DRF Response) is rendered, which is where serialization to bytes happens.
+        if hasattr(request, "_timing"):
+            request._timing["view_end"] = time.perf_counter()
+            response.add_post_render_callback(lambda rendered: self.mark_rendered(request))
+        return response
+
+    def mark_rendered(self, request):
+        request._timing["render_end"] = time.perf_counter()
+
+    def build_timings(self, request, recorder, total_ms):
+        marks = request._timing
+        view_ms = render_ms = None
+        if "view_start" in marks and "view_end" in marks:
+            view_ms = (marks["view_end"] - marks["view_start"]) * 1000
+            if "render_end" in marks:
+                render_ms = (marks["render_end"] - marks["view_end"]) * 1000
+        slowest_sql, slowest_ms = recorder.slowest
+        return {
+            "total_ms": round(total_ms, 2),
+            "view_ms": round(view_ms, 2) if view_ms is not None else None,
+            "render_ms": round(render_ms, 2) if render_ms is not None else None,
+            "db_ms": round(recorder.total_ms, 2),
+            "queries": len(recorder.queries),
+            "slowest_query_ms": round(slowest_ms, 2),
+            "slowest_query": slowest_sql[:500] if slowest_sql else None,
+        }
+
+    def server_timing(self, timings):
+        metrics = [f'db;dur={timings["db_ms"]};desc="{timings["queries"]} queries"']
+        if timings["view_ms"] is not None:
+            metrics.append(f'view;dur={timings["view_ms"]}')
+        if timings["render_ms"] is not None:
+            metrics.append(f'render;dur={timings["render_ms"]}')
+        metrics.append(f'total;dur={timings["total_ms"]}')
+        return ", ".join(metrics)
+
+    def log(self, request, response, timings, recorder):
+        entry = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "user_id": getattr(getattr(request, "user", None), "id", None),
+            **timings,
+        }
+        logger.info(json.dumps(entry))
+
+        if timings["total_ms"] > self.slow_ms or timings["queries"] > self.max_queries:
+            entry["all_queries"] = [{"sql": sql, "ms": round(ms, 2)} for sql, ms in recorder.queries]
+            slow_logger.warning(json.dumps(entry))
@@ -10,9 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import sys
 from pathlib import Path
 from decouple import config
 from datetime import timedelta
+from celery.schedules import crontab
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,12 +50,21 @@ INSTALLED_APPS = [
     'expenses',
     'incomes',
     'budgets',
+    'rollups',
+    'apicache',
+    'outbox',
+    'benchmarks',
+    'metrics',
+    'profiling',
     "drf_yasg",
 ]
 
 MIDDLEWARE = [
     
     'django.middleware.security.SecurityMiddleware',
+    'metrics.middleware.MetricsMiddleware',
+    # Off unless REQUEST_TIMING_SAMPLE_RATE > 0
+    'backend.middleware.RequestTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,6 +72,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Only does work for ?_profile=1 requests from staff / admin-role users
+    'profiling.middleware.ProfilingMiddleware',
     
 ]
 
@@ -136,6 +149,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded files (spooled CSV imports and their error reports)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -154,6 +171,10 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Keyset pagination for list endpoints (?page_size= overrides the default, up to the max)
+API_PAGE_SIZE = config("API_PAGE_SIZE", default=50, cast=int)
+API_MAX_PAGE_SIZE = config("API_MAX_PAGE_SIZE", default=500, cast=int)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "AUTH_HEADER_TYPES": ("Bearer",),
@@ -178,6 +199,52 @@ CELERY_BROKER_URL = "redis://localhost:6379/0"
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 
+# Shared cache (response cache, debounce keys). Redis in production, since it
+# already runs as the Celery broker; tests use an in-process cache.
+if "test" in sys.argv or config("CACHE_LOCMEM", default=False, cast=bool):
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": config("CACHE_REDIS_URL", default="redis://localhost:6379/1"),
+        },
+    }
+
+# Seconds a cached summary/analytics response is kept. Entries are also
+# invalidated as soon as the user's data changes.
+RESPONSE_CACHE_TIMEOUT = config("RESPONSE_CACHE_TIMEOUT", default=300, cast=int)
+
+
+# Seconds to wait before evaluating budget thresholds after an expense is saved;
+# further expenses for the same category and month within the window are merged.
+BUDGET_CHECK_DELAY = config("BUDGET_CHECK_DELAY", default=30, cast=int)
+
+# Send budget alerts as one daily digest email per user instead of one email
+# per alert (requires Celery beat for send_budget_alert_digests).
+BUDGET_ALERT_DIGEST = config("BUDGET_ALERT_DIGEST", default=False, cast=bool)
+
+# Outbox dispatcher: how often beat publishes queued tasks, and rows per batch.
+OUTBOX_DISPATCH_INTERVAL = config("OUTBOX_DISPATCH_INTERVAL", default=2.0, cast=float)
+OUTBOX_BATCH_SIZE = config("OUTBOX_BATCH_SIZE", default=100, cast=int)
+# Publish attempts before a failing message is marked dead and no longer retried.
+OUTBOX_MAX_ATTEMPTS = config("OUTBOX_MAX_ATTEMPTS", default=10, cast=int)
+# Tasks taking one list argument whose pending messages are merged into a single
+# call per dispatch batch (send_emails: one SMTP connection for a burst of emails).
+OUTBOX_MERGE_TASKS = ["users.tasks.send_emails"]
+
+CELERY_BEAT_SCHEDULE = {
+    "dispatch-outbox": {
+        "task": "outbox.tasks.dispatch_outbox",
+        "schedule": timedelta(seconds=OUTBOX_DISPATCH_INTERVAL),
+    },
+    "send-budget-alert-digests": {
+        "task": "budgets.tasks.send_budget_alert_digests",
+        "schedule": crontab(hour=8, minute=0),
+    },
+}
 
 EMAIL_BACKEND = config("EMAIL_BACKEND")
 EMAIL_HOST = config("EMAIL_HOST")
@@ -186,3 +253,62 @@ EMAIL_USE_TLS = config("EMAIL_USE_TLS", cast=bool)
 EMAIL_HOST_USER = config("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = config("EMAIL_HOST_USER")
+
+# Emails sent per SMTP connection by the batch email tasks
+EMAIL_BATCH_SIZE = config("EMAIL_BATCH_SIZE", default=100, cast=int)
+
+# Number of rows buffered per bulk_create during CSV expense imports
+EXPENSE_IMPORT_BATCH_SIZE = config("EXPENSE_IMPORT_BATCH_SIZE", default=1000, cast=int)
+
+# Max expenses accepted by one POST /api/expenses/batch/
+EXPENSE_BATCH_MAX_SIZE = config("EXPENSE_BATCH_MAX_SIZE", default=500, cast=int)
+
+# Request instrumentation (backend.middleware.RequestTimingMiddleware):
+# share of requests to instrument (0 = off, 1 = all), and the thresholds above
+# which a request's full query list is logged.
+REQUEST_TIMING_SAMPLE_RATE = config("REQUEST_TIMING_SAMPLE_RATE", default=0.0, cast=float)
+REQUEST_TIMING_SLOW_MS = config("REQUEST_TIMING_SLOW_MS", default=500, cast=int)
+REQUEST_TIMING_MAX_QUERIES = config("REQUEST_TIMING_MAX_QUERIES", default=20, cast=int)
+
+# Prometheus metrics at /api/metrics/ (metrics app). Set METRICS_MULTIPROC_DIR to a
+# directory shared by all gunicorn and Celery worker processes on the host (emptied on
+# deploy) to report them together; each process writes its samples there every
+# METRICS_FLUSH_INTERVAL seconds.
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+METRICS_MULTIPROC_DIR = config("METRICS_MULTIPROC_DIR", default="")
+METRICS_FLUSH_INTERVAL = config("METRICS_FLUSH_INTERVAL", default=5.0, cast=float)
+
+# On-demand profiling (?_profile=1, staff and admin-role users): reports are kept
+# in the cache for PROFILE_REPORT_TIMEOUT seconds under /api/profiles/<id>/.
+PROFILING_ENABLED = config("PROFILING_ENABLED", default=True, cast=bool)
+PROFILE_REPORT_TIMEOUT = config("PROFILE_REPORT_TIMEOUT", default=3600, cast=int)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "backend.requests": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
+# Max ids accepted by the bulk-update/ and bulk-delete/ endpoints
+BULK_MAX_IDS = config("BULK_MAX_IDS", default=1000, cast=int)
+
+# Rows fetched per round trip when streaming CSV/NDJSON exports
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# Max background import jobs a single user may have pending or running at once
+EXPENSE_IMPORT_MAX_ACTIVE_JOBS = config("EXPENSE_IMPORT_MAX_ACTIVE_JOBS", default=2, cast=int)
+
+# Seconds without progress after which a running import job (its worker is presumed
+# dead), or a pending one no worker picked up, is marked failed; swept by beat every
+# EXPENSE_IMPORT_STALE_SWEEP_INTERVAL.
+EXPENSE_IMPORT_STALE_AFTER = config("EXPENSE_IMPORT_STALE_AFTER", default=900, cast=int)
+EXPENSE_IMPORT_STALE_SWEEP_INTERVAL = config("EXPENSE_IMPORT_STALE_SWEEP_INTERVAL", default=300, cast=int)
+CELERY_BEAT_SCHEDULE["fail-stale-import-jobs"] = {
+    "task": "expenses.tasks.fail_stale_import_jobs",
+    "schedule": timedelta(seconds=EXPENSE_IMPORT_STALE_SWEEP_INTERVAL),
+}
@@ -0,0 +1,93 @@
+"""
+Query-count assertions for tests and benchmarks.
+
+Usage in a test case:
+
+    class ExpenseListQueryTests(QueryCountAssertionsMixin, APITestCase):
+        def test_list_query_count_is_constant(self):
+            self.client.force_authenticate(self.user)
+            self.assertQueriesConstant("/api/expenses/", grow=lambda size: make_expenses(self.user, size))
+"""
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+def format_queries(captured):
+    return "\n".join(
+        f"{index}. {query['sql']}" for index, query in enumerate(captured.captured_queries, start=1)
+    )
+
+
+def count_queries(func, using=DEFAULT_DB_ALIAS):
+    """
+    Run `func` and return (number_of_queries, result).
+    """
+    with CaptureQueriesContext(connections[using]) as captured:
+        result = func()
+    return len(captured), result
+
+
+@contextmanager
+def assert_max_queries(limit, using=DEFAULT_DB_ALIAS):
+    """
+    Fail if the wrapped block runs more than `limit` queries.
+    """
+    with CaptureQueriesContext(connections[using]) as captured:
+        yield captured
+    if len(captured) > limit:
+        raise AssertionError(
+            f"{len(captured)} queries executed, {limit} allowed:\n{format_queries(captured)}"
+        )
+
+
+def assert_constant_queries(func, grow, sizes=(1, 10, 50), expected=None, using=DEFAULT_DB_ALIAS):
+    """
+    Pin the query count of `func` independently of result size.
+
+    `grow(size)` must bring the dataset up to `size` rows (it is called with
+    increasing sizes); `func` is then run and its queries counted. Fails if the
+    count differs between sizes (an N+1) or, when given, from `expected`.
+    Returns the pinned count.
+    """
+    counts = {}
+    for size in sizes:
+        grow(size)
+        counts[size], _ = count_queries(func, using=using)
+
+    distinct = set(counts.values())
+    if len(distinct) > 1:
+        raise AssertionError(f"Query count grows with result size: {counts}")
+    count = distinct.pop()
+    if expected is not None and count != expected:
+        raise AssertionError(f"Expected {expected} queries, got {count} (sizes {list(counts)})")
+    return count
+
+
+class QueryCountAssertionsMixin:
+    """
+    unittest-style wrappers around the module-level assertions.
+    """
+
+    def assertMaxQueries(self, limit, using=DEFAULT_DB_ALIAS):
+        return assert_max_queries(limit, using=using)
+
+    def assertConstantQueries(self, func, grow, sizes=(1, 10, 50), expected=None, using=DEFAULT_DB_ALIAS):
+        return assert_constant_queries(func, grow, sizes=sizes, expected=expected, using=using)
+
+    def assertQueriesConstant(self, url, grow, sizes=(1, 10, 50), expected=None, using=DEFAULT_DB_ALIAS):
+        """
+        assertConstantQueries for a GET of `url` with self.client, which must
+        answer 200; a streamed body is consumed so its queries are counted.
+        """
+        def fetch():
+            # Cache invalidation runs on commit, which a TestCase never reaches.
+            cache.clear()
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            if response.streaming:
+                b"".join(response.streaming_content)
+
+        return self.assertConstantQueries(fetch, grow, sizes=sizes, expected=expected, using=using)
@@ -28,6 +28,9 @@ urlpatterns = [
     path('api/expenses/', include('expenses.urls')),
     path('api/incomes/', include('incomes.urls')),
     path('api/budgets/', include('budgets.urls')),
+    path('api/cache/', include('apicache.urls')),
+    path('api/metrics/', include('metrics.urls')),
+    path('api/profiles/', include('profiling.urls')),
 
     # Swagger and ReDoc documentation
     re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
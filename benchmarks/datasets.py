@@ -0,0 +1,131 @@
+"""
+Deterministic datasets for benchmarks.
+
+The same scale and seed always produce the same rows (dates are fixed, not
+relative to today), so timings and query counts are comparable between runs.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from backend.dates import add_months, iter_months
+from budgets.models import Budget, MonthlyBudget
+from categories.models import Category
+from expenses.models import Expense
+from incomes.models import Income
+from rollups import services as rollups
+
+EXPENSE_CATEGORIES = ["Food", "Rent", "Transport", "Utilities", "Entertainment", "Health", "Shopping", "Travel"]
+INCOME_CATEGORIES = ["Salary", "Freelance", "Investments"]
+
+FIRST_MONTH = date(2024, 1, 1)
+LAST_MONTH = date(2025, 12, 1)
+
+USER_EMAIL = "bench{index}@bench.local"
+USER_PASSWORD = "bench-password"
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    expenses_per_user: int
+
+    @property
+    def expenses(self):
+        return self.users * self.expenses_per_user
+
+
+SCALES = {
+    "1k": Scale(users=10, expenses_per_user=100),
+    "100k": Scale(users=100, expenses_per_user=1000),
+    "1m": Scale(users=1000, expenses_per_user=1000),
+}
+
+
+def ensure_categories():
+    """
+    {(type, name): Category} for the benchmark categories, creating missing ones.
+    """
+    categories = {}
+    for type, names in (("expense", EXPENSE_CATEGORIES), ("income", INCOME_CATEGORIES)):
+        for name in names:
+            category, _ = Category.objects.get_or_create(name=name, type=type)
+            categories[(type, name)] = category
+    return categories
+
+
+def random_amount(rng, low, high):
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+def generate_user_rows(rng, user, categories, expenses):
+    """
+    Expenses, incomes, budgets and monthly budgets of one user, drawn from `rng`.
+    Returns a dict of model -> list of unsaved instances.
+    """
+    expense_categories = [categories[("expense", name)] for name in EXPENSE_CATEGORIES]
+    months = list(iter_months(FIRST_MONTH, LAST_MONTH))
+    span_days = (add_months(LAST_MONTH, 1) - FIRST_MONTH).days
+
+    rows = {Expense: [], Income: [], Budget: [], MonthlyBudget: []}
+    for index in range(expenses):
+        rows[Expense].append(Expense(
+            user=user,
+            title=f"Expense {index}",
+            amount=random_amount(rng, 1, 5000),
+            date=FIRST_MONTH + timedelta(days=rng.randrange(span_days)),
+            category=rng.choice(expense_categories),
+            notes="" if rng.random() < 0.7 else "seeded",
+        ))
+
+    for month in months:
+        rows[Income].append(Income(
+            user=user, title="Salary", amount=random_amount(rng, 40000, 90000),
+            date=month, category=categories[("income", "Salary")],
+        ))
+        for category in expense_categories:
+            rows[Budget].append(Budget(
+                user=user, category=category, month=month, amount=random_amount(rng, 2000, 20000),
+            ))
+        rows[MonthlyBudget].append(MonthlyBudget(user=user, month=month, amount=random_amount(rng, 40000, 80000)))
+    return rows
+
+
+def seed(scale, seed=42, batch_size=5000):
+    """
+    Create the users and rows of `scale` (a Scale) and rebuild their rollups.
+    Returns the users, bench0 first.
+    """
+    rng = random.Random(seed)
+    categories = ensure_categories()
+    password = make_password(USER_PASSWORD)
+
+    User = get_user_model()
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(username=f"bench{index}", email=USER_EMAIL.format(index=index), password=password, is_active=True)
+            for index in range(scale.users)
+        ])
+        users = list(User.objects.filter(email__in=[user.email for user in users]).order_by("id"))
+
+        for user in users:
+            rows = generate_user_rows(rng, user, categories, scale.expenses_per_user)
+            for model, instances in rows.items():
+                model.objects.bulk_create(instances, batch_size=batch_size)
+
+        # bulk_create sends no signals, so build the rollups in one pass.
+        rollups.rebuild(user_ids=[user.id for user in users])
+    return users
+
+
+def seeded_users():
+    """
+    Benchmark users already in the database, bench0 first.
+    """
+    User = get_user_model()
+    return list(User.objects.filter(email__endswith="@bench.local").order_by("id"))
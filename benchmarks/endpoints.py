@@ -0,0 +1,154 @@
+"""
+The API endpoints timed by `manage.py bench_endpoints`, with their budgets.
+
+Query budgets include the JWT user lookup and are independent of the dataset
+size: exceeding one means an N+1 or a lost optimisation. Latency budgets
+(p95, milliseconds) depend on the scale and the machine, see LATENCY_BUDGETS_MS.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from .datasets import USER_PASSWORD
+
+
+@dataclass
+class Endpoint:
+    name: str
+    path: str
+    method: str = "get"
+    max_queries: Optional[int] = None
+    # Builds the request body from the benchmark context (writes only).
+    body: Optional[Callable[[dict], object]] = None
+    # Writes are rolled back after every call so the dataset never changes.
+    write: bool = False
+    # "json" or "multipart" (file uploads).
+    format: str = "json"
+    extra: dict = field(default_factory=dict)
+
+
+# Writes: user lookup, INSERT, rollup UPDATE (+ INSERT when the month/category
+# row is new) and the outbox row for the budget check.
+def new_expense(ctx):
+    return {"title": "Bench", "amount": "42.50", "date": ctx["last_date"], "category_id": ctx["category_id"]}
+
+
+def new_income(ctx):
+    return {"title": "Bench", "amount": "1000", "date": ctx["last_date"], "category_id": ctx["income_category_id"]}
+
+
+def upload_csv(ctx, rows=100):
+    lines = ["title,amount,date,category,notes"]
+    lines += [f"Bench {index},{index + 1}.25,{ctx['last_date']},{ctx['category_name']}," for index in range(rows)]
+    return {"file": SimpleUploadedFile("bench.csv", "\n".join(lines).encode("utf-8"), content_type="text/csv")}
+
+
+def new_user(ctx):
+    return {
+        "email": "new@bench-auth.local", "username": "bench-new",
+        "password": USER_PASSWORD, "confirm_password": USER_PASSWORD,
+    }
+
+
+# The auth endpoints come first: verify_email needs the OTP created with the
+# benchmark context to still be inside its 10-minute window.
+ENDPOINTS = [
+    Endpoint("protected", "/api/protected/", max_queries=1),
+    Endpoint(
+        "verify_email", "/api/verify-email/", method="post", write=True, max_queries=5,
+        body=lambda ctx: {"email": ctx["pending_email"], "otp": ctx["otp"]},
+    ),
+    Endpoint(
+        "resend_otp", "/api/resend-otp/", method="post", write=True, max_queries=5,
+        body=lambda ctx: {"email": ctx["pending_email"]},
+    ),
+    Endpoint(
+        "token_refresh", "/api/token/refresh/", method="post", write=True, max_queries=9,
+        body=lambda ctx: {"refresh": ctx["refresh"]},
+    ),
+    Endpoint(
+        "logout", "/api/logout/", method="post", write=True, max_queries=6,
+        body=lambda ctx: {"refresh": ctx["refresh"]},
+    ),
+    # login and register hash a password, so their latency is mostly the hasher's.
+    Endpoint(
+        "login", "/api/login-expense/", method="post", max_queries=4,
+        body=lambda ctx: {"email": ctx["email"], "password": USER_PASSWORD},
+    ),
+    Endpoint("register", "/api/register/", method="post", body=new_user, write=True, max_queries=7),
+    Endpoint("categories", "/api/categories/", max_queries=1),
+    Endpoint("expense_list", "/api/expenses/", max_queries=2),
+    Endpoint("expense_list_page", "/api/expenses/?page_size=50", max_queries=2),
+    Endpoint("expense_detail", "/api/expenses/{expense_id}/", max_queries=2),
+    Endpoint("expense_export_csv", "/api/expenses/export/?start={first_date}&end={last_date}", max_queries=2),
+    Endpoint(
+        "expense_export_ndjson", "/api/expenses/export/?output=ndjson&start={first_date}&end={last_date}",
+        max_queries=2,
+    ),
+    Endpoint("summary_by_category", "/api/expenses/summary-by-category/?month={month}", max_queries=2),
+    Endpoint("monthly_expense_summary", "/api/expenses/monthly-summary/?from={first_month}&to={month}", max_queries=2),
+    Endpoint("income_vs_expense", "/api/expenses/summary/income-vs-expense/?from={first_month}&to={month}", max_queries=3),
+    Endpoint("income_list", "/api/incomes/", max_queries=2),
+    Endpoint("monthly_income_summary", "/api/incomes/summary/?month={month}", max_queries=2),
+    Endpoint("salary_check", "/api/incomes/check-salary-exists/?month={month}", max_queries=2),
+    Endpoint("budget_list", "/api/budgets/", max_queries=2),
+    Endpoint("budget_summary", "/api/budgets/summary/?month={month}", max_queries=2),
+    Endpoint("budgets_by_month", "/api/budgets/by-month/?month={month}", max_queries=2),
+    Endpoint("analytics_month", "/api/budgets/analytics/?month={month}", max_queries=4),
+    Endpoint("analytics_range", "/api/budgets/analytics/?from={first_month}&to={month}", max_queries=4),
+    Endpoint("monthly_budget_list", "/api/budgets/monthlybudgets/", max_queries=2),
+    Endpoint("expense_create", "/api/expenses/", method="post", body=new_expense, write=True, max_queries=5),
+    Endpoint(
+        "expense_batch_create", "/api/expenses/batch/", method="post",
+        body=lambda ctx: [new_expense(ctx) for _ in range(20)], write=True, max_queries=5,
+    ),
+    Endpoint(
+        "expense_upload_csv", "/api/expenses/upload/bulk/", method="post",
+        body=upload_csv, format="multipart", write=True, max_queries=4,
+    ),
+    Endpoint("income_create", "/api/incomes/", method="post", body=new_income, write=True, max_queries=4),
+    Endpoint(
+        "budget_create", "/api/budgets/", method="post", write=True, max_queries=3,
+        body=lambda ctx: {"category": ctx["category_id"], "month": ctx["next_month_start"], "amount": "5000"},
+    ),
+    # A budget update is only proposed here: it stores the pending change and the confirmation email.
+    Endpoint(
+        "budget_update", "/api/budgets/{budget_id}/", method="put", write=True, max_queries=4,
+        body=lambda ctx: {"amount": "6000"},
+    ),
+    Endpoint(
+        "expense_bulk_update_notes", "/api/expenses/bulk-update/", method="post",
+        body=lambda ctx: {"filter": {"start": ctx["last_month_start"]}, "changes": {"notes": "bench"}},
+        write=True, max_queries=2,
+    ),
+]
+
+# p95 budget in milliseconds per scale, for every endpoint unless overridden.
+# Auth and write endpoints do not depend on the dataset size, except the CSV
+# upload and the export, whose cost grows with the rows they touch.
+AUTH_LATENCY_MS = {
+    "protected": 50, "verify_email": 100, "resend_otp": 100, "token_refresh": 100, "logout": 100,
+    # One password hash each (PBKDF2 with Django's default iterations).
+    "login": 1000, "register": 1000,
+}
+WRITE_LATENCY_MS = {"income_create": 100, "budget_create": 100, "budget_update": 100}
+
+LATENCY_BUDGETS_MS = {
+    "1k": {
+        "default": 100, **AUTH_LATENCY_MS, **WRITE_LATENCY_MS,
+        "expense_upload_csv": 150, "expense_export_ndjson": 100,
+    },
+    "100k": {
+        "default": 250, **AUTH_LATENCY_MS, **WRITE_LATENCY_MS,
+        "expense_list": 600, "expense_export_csv": 600, "expense_export_ndjson": 600, "expense_upload_csv": 250,
+    },
+    "1m": {
+        "default": 500, **AUTH_LATENCY_MS, **WRITE_LATENCY_MS,
+        "expense_list": 1000, "expense_export_csv": 1000, "expense_export_ndjson": 1000, "expense_upload_csv": 500,
+    },
+}
+
+def latency_budget(scale, endpoint):
+    budgets = LATENCY_BUDGETS_MS.get(scale, {})
+    return budgets.get(endpoint.name, budgets.get("default"))
@@ -0,0 +1,226 @@
+"""
+Fast synthetic data for load testing (`manage.py seed_load_data`).
+
+Rows are generated per user from an RNG seeded with (seed, user index), so the
+data is identical for a given seed no matter how many worker processes share
+the work. Rows are written as plain tuples, either with PostgreSQL
+COPY FROM STDIN or with bulk_create batches on other databases (followed by
+a bulk_update that restores the generated created_at values).
+"""
+import calendar
+import csv
+import io
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import connection, transaction
+
+from backend.dates import add_months, iter_months
+from budgets.models import Budget, MonthlyBudget
+from expenses.models import Expense
+from incomes.models import Income
+from rollups import services as rollups
+
+# Expense category -> (typical titles, min amount, max amount) for random spending.
+SPENDING_PROFILES = {
+    "Food": (["Groceries", "Restaurant", "Coffee", "Takeaway"], 50, 2500),
+    "Transport": (["Fuel", "Cab", "Metro card", "Parking"], 30, 3000),
+    "Utilities": (["Mobile recharge", "Water bill", "Gas cylinder"], 100, 2500),
+    "Entertainment": (["Movie", "Concert", "Games"], 150, 4000),
+    "Health": (["Pharmacy", "Doctor visit", "Lab test"], 100, 6000),
+    "Shopping": (["Clothes", "Electronics", "Home goods"], 300, 15000),
+    "Travel": (["Train tickets", "Flight", "Hotel"], 1000, 30000),
+    "Rent": (["Maintenance", "Repairs"], 500, 5000),
+}
+
+# (category, title, day of month, min amount, max amount), charged every month.
+RECURRING_EXPENSES = [
+    ("Rent", "Monthly rent", 1, 8000, 40000),
+    ("Utilities", "Electricity bill", 10, 800, 4000),
+    ("Utilities", "Internet", 12, 500, 1500),
+    ("Entertainment", "Streaming subscription", 15, 199, 799),
+]
+
+TABLES = {
+    Expense: ("title", "amount", "category_id", "date", "user_id", "notes", "created_at"),
+    Income: ("title", "amount", "date", "category_id", "notes", "user_id", "created_at"),
+    Budget: ("user_id", "category_id", "month", "amount"),
+    MonthlyBudget: ("user_id", "month", "amount"),
+}
+
+
+@dataclass(frozen=True)
+class LoadSpec:
+    users: int
+    expenses_per_user: int
+    first_month: date
+    last_month: date
+    seed: int = 42
+    # 0 spreads activity evenly; higher values concentrate expenses on a few
+    # users and a few categories (Zipf-like, weight = 1 / rank ** skew).
+    skew: float = 1.0
+    recurring: bool = True
+    # Share of (month, category) pairs that get a budget.
+    budget_coverage: float = 0.75
+
+
+def zipf_weights(count, skew):
+    return [1 / (rank ** skew) for rank in range(1, count + 1)]
+
+
+def expenses_for_users(spec):
+    """
+    Random (non-recurring) expense count per user index, summing to
+    users * expenses_per_user.
+    """
+    weights = zipf_weights(spec.users, spec.skew)
+    total = spec.users * spec.expenses_per_user
+    scale = total / sum(weights)
+    return [round(weight * scale) for weight in weights]
+
+
+def money(rng, low, high):
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+def created_at(day):
+    return datetime.combine(day, time(12), tzinfo=dt_timezone.utc)
+
+
+def clamp_day(month, day):
+    return month.replace(day=min(day, calendar.monthrange(month.year, month.month)[1]))
+
+
+def generate_user_rows(spec, user_index, user_id, expense_count, categories):
+    """
+    {model: [row tuple, ...]} for one user, column order as in TABLES.
+    `categories` maps (type, name) -> category id.
+    """
+    rng = random.Random(f"{spec.seed}:{user_index}")
+    months = list(iter_months(spec.first_month, spec.last_month))
+    span_days = (add_months(spec.last_month, 1) - spec.first_month).days
+    rows = {model: [] for model in TABLES}
+
+    # Each user favours categories in their own order.
+    names = list(SPENDING_PROFILES)
+    rng.shuffle(names)
+    weights = zipf_weights(len(names), spec.skew)
+    spent = {}
+
+    for _ in range(expense_count):
+        name = rng.choices(names, weights)[0]
+        titles, low, high = SPENDING_PROFILES[name]
+        day = spec.first_month.fromordinal(spec.first_month.toordinal() + rng.randrange(span_days))
+        amount = money(rng, low, high)
+        rows[Expense].append((
+            rng.choice(titles), amount, categories[("expense", name)], day, user_id,
+            "seeded" if rng.random() < 0.2 else None, created_at(day),
+        ))
+        spent[(day.replace(day=1), name)] = spent.get((day.replace(day=1), name), 0) + amount
+
+    salary = money(rng, 30000, 150000)
+    recurring = [(name, title, day, money(rng, low, high)) for name, title, day, low, high in RECURRING_EXPENSES]
+    for month in months:
+        if spec.recurring:
+            for name, title, day, amount in recurring:
+                day = clamp_day(month, day)
+                rows[Expense].append((title, amount, categories[("expense", name)], day, user_id, None, created_at(day)))
+                spent[(month, name)] = spent.get((month, name), 0) + amount
+            rows[Income].append(("Salary", salary, month, categories[("income", "Salary")], None, user_id, created_at(month)))
+        if rng.random() < 0.3:
+            day = clamp_day(month, rng.randint(1, 28))
+            rows[Income].append((
+                "Freelance project", money(rng, 2000, 40000), day,
+                categories[("income", "Freelance")], None, user_id, created_at(day),
+            ))
+
+        month_total = Decimal(0)
+        for name in SPENDING_PROFILES:
+            if rng.random() >= spec.budget_coverage:
+                continue
+            # Budgets sit around actual spending, so some months run over.
+            expected = spent.get((month, name), Decimal(0)) or money(rng, 500, 5000)
+            amount = (expected * Decimal(rng.uniform(0.8, 1.4))).quantize(Decimal("0.01"))
+            rows[Budget].append((user_id, categories[("expense", name)], month, amount))
+            month_total += amount
+        if month_total:
+            rows[MonthlyBudget].append((user_id, month, month_total))
+    return rows
+
+
+def supports_copy():
+    return connection.vendor == "postgresql"
+
+
+def copy_rows(model, rows):
+    """
+    Stream rows into the model's table with COPY FROM STDIN (PostgreSQL).
+    """
+    columns = TABLES[model]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+    buffer.seek(0)
+
+    table = connection.ops.quote_name(model._meta.db_table)
+    column_list = ", ".join(connection.ops.quote_name(column) for column in columns)
+    sql = f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):  # psycopg2
+            raw.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+def bulk_rows(model, rows, batch_size):
+    columns = TABLES[model]
+    objs = [model(**dict(zip(columns, row))) for row in rows]
+    model.objects.bulk_create(objs, batch_size=batch_size)
+    if "created_at" in columns:
+        # created_at is auto_now_add, so bulk_create stamped every row with the
+        # current time; write the generated timestamps back.
+        index = columns.index("created_at")
+        for obj, row in zip(objs, rows):
+            obj.created_at = row[index]
+        model.objects.bulk_update(objs, ["created_at"], batch_size=batch_size)
+
+
+def write_rows(model, rows, method, batch_size):
+    if not rows:
+        return
+    with transaction.atomic():
+        if method == "copy":
+            copy_rows(model, rows)
+        else:
+            bulk_rows(model, rows, batch_size)
+
+
+def seed_shard(spec, shard, categories, method, batch_size):
+    """
+    Generate and write the rows of `shard`, a list of (user_index, user_id,
+    expense_count), flushing every `batch_size` rows per table, then rebuild
+    the shard's rollups. Returns {table name: rows written}.
+    """
+    pending = {model: [] for model in TABLES}
+    written = {model._meta.db_table: 0 for model in TABLES}
+
+    def flush(model):
+        write_rows(model, pending[model], method, batch_size)
+        written[model._meta.db_table] += len(pending[model])
+        pending[model] = []
+
+    for user_index, user_id, expense_count in shard:
+        for model, rows in generate_user_rows(spec, user_index, user_id, expense_count, categories).items():
+            pending[model].extend(rows)
+            if len(pending[model]) >= batch_size:
+                flush(model)
+    for model in TABLES:
+        flush(model)
+
+    rollups.rebuild(user_ids=[user_id for _, user_id, _ in shard])
+    return written
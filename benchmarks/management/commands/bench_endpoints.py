@@ -0,0 +1,208 @@
+import math
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apicache.services import bump_version
+from benchmarks import datasets
+from benchmarks.endpoints import ENDPOINTS, latency_budget
+from budgets.models import Budget
+from expenses.models import Expense
+from users.models import OneTimePassword
+
+# Not matched by datasets.seeded_users() (...@bench.local).
+PENDING_EMAIL = "pending@bench-auth.local"
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# Transaction control is not counted: it depends on how the benchmark wraps calls.
+TRANSACTION_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT", "BEGIN", "COMMIT")
+
+
+def count_data_queries(captured):
+    return sum(
+        1 for query in captured.captured_queries
+        if not query["sql"].lstrip().upper().startswith(TRANSACTION_STATEMENTS)
+    )
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    """
+    Time every API endpoint against a seeded, deterministic dataset.
+
+    Runs in a separate test database (like `manage.py test`), seeds it at the
+    chosen scale, then calls each endpoint through the DRF test client as the
+    first benchmark user with a real JWT. Reports p50/p95 latency, SQL query
+    count and peak Python memory per endpoint, and exits non-zero when a query
+    or latency budget from benchmarks/endpoints.py is exceeded.
+
+    Usage:
+        python manage.py bench_endpoints                        # 1k expenses
+        python manage.py bench_endpoints --scale 100k --keepdb  # reuse the seeded test DB
+        python manage.py bench_endpoints --only budget_summary --only expense_list
+        python manage.py bench_endpoints --queries-only         # skip latency budgets (noisy CI)
+
+    Response caches are invalidated before every call, so the numbers are for
+    the uncached path; pass --warm-cache to measure cache hits instead.
+    """
+    help = "Benchmark API endpoints (latency, queries, memory) against seeded data."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(datasets.SCALES), default="1k")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--only", action="append", help="Endpoint name to run (repeatable).")
+        parser.add_argument("--keepdb", action="store_true", help="Keep the test database (and its data) between runs.")
+        parser.add_argument("--warm-cache", action="store_true", help="Do not invalidate response caches between calls.")
+        parser.add_argument("--queries-only", action="store_true", help="Only enforce query budgets.")
+
+    def handle(self, *args, **options):
+        endpoints = [e for e in ENDPOINTS if not options["only"] or e.name in options["only"]]
+        if not endpoints:
+            raise CommandError(f"No endpoint matches {options['only']}.")
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options["keepdb"])
+        try:
+            with override_settings(CACHES=LOCMEM_CACHE):
+                failures = self.run(endpoints, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        if failures:
+            raise CommandError("Budgets exceeded:\n" + "\n".join(f"  {failure}" for failure in failures))
+        self.stdout.write(self.style.SUCCESS("All endpoints within budget."))
+
+    def run(self, endpoints, options):
+        scale = datasets.SCALES[options["scale"]]
+        users = datasets.seeded_users()
+        if len(users) != scale.users or Expense.objects.filter(user=users[0]).count() != scale.expenses_per_user:
+            if users:
+                raise CommandError("The kept test database holds another scale; rerun without --keepdb.")
+            self.stdout.write(f"Seeding {scale.expenses} expenses for {scale.users} users...")
+            started = time.perf_counter()
+            users = datasets.seed(scale, seed=options["seed"])
+            self.stdout.write(f"Seeded in {time.perf_counter() - started:.1f}s.")
+
+        user = users[0]
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        context = self.build_context(user)
+
+        self.stdout.write(
+            f"{'endpoint':<28}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}{'peak KiB':>10}"
+        )
+        failures = []
+        for endpoint in endpoints:
+            result = self.measure(client, endpoint, context, user, options)
+            self.stdout.write(
+                f"{endpoint.name:<28}{result['status']:>7}{result['p50']:>10.1f}{result['p95']:>10.1f}"
+                f"{result['queries']:>9}{result['peak_kib']:>10.0f}"
+            )
+            failures.extend(self.check_budgets(endpoint, result, options))
+        return failures
+
+    def build_context(self, user):
+        last_month = datasets.LAST_MONTH
+        categories = datasets.ensure_categories()
+        category = categories[("expense", datasets.EXPENSE_CATEGORIES[0])]
+        pending_user, otp = self.pending_signup()
+        return {
+            "month": f"{last_month:%Y-%m}",
+            "first_month": f"{datasets.FIRST_MONTH:%Y-%m}",
+            "first_date": datasets.FIRST_MONTH.isoformat(),
+            "last_date": last_month.replace(day=28).isoformat(),
+            "last_month_start": last_month.isoformat(),
+            "expense_id": Expense.objects.filter(user=user).order_by("id").values_list("id", flat=True).first(),
+            "next_month_start": (last_month + timedelta(days=31)).replace(day=1).isoformat(),
+            "category_id": category.id,
+            "category_name": category.name,
+            "income_category_id": categories[("income", datasets.INCOME_CATEGORIES[0])].id,
+            "budget_id": Budget.objects.filter(user=user).order_by("id").values_list("id", flat=True).first(),
+            "email": user.email,
+            "refresh": str(RefreshToken.for_user(user)),
+            "pending_email": pending_user.email,
+            "otp": otp.otp,
+        }
+
+    def pending_signup(self):
+        """
+        An unverified user with a fresh OTP, for the verify-email / resend-otp endpoints.
+        """
+        User = get_user_model()
+        pending_user, _ = User.objects.get_or_create(
+            email=PENDING_EMAIL, defaults={"username": "bench-pending", "is_active": False},
+        )
+        return pending_user, OneTimePassword.objects.create(user=pending_user, otp="123456")
+
+    def call(self, client, endpoint, context):
+        path = endpoint.path.format(**context)
+        body = endpoint.body(context) if endpoint.body else None
+        response = getattr(client, endpoint.method)(path, body, format=endpoint.format) if body is not None \
+            else getattr(client, endpoint.method)(path)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
+
+    def measure(self, client, endpoint, context, user, options):
+        def once(capture=False):
+            if not options["warm_cache"]:
+                bump_version(user.id)
+            with transaction.atomic():
+                if capture:
+                    with CaptureQueriesContext(connection) as queries:
+                        response = self.call(client, endpoint, context)
+                else:
+                    response = self.call(client, endpoint, context)
+                if endpoint.write:
+                    transaction.set_rollback(True)
+            return response, (count_data_queries(queries) if capture else None)
+
+        once()  # warm up imports and the category registry
+        response, queries = once(capture=True)
+
+        timings = []
+        for _ in range(options["iterations"]):
+            started = time.perf_counter()
+            once()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        tracemalloc.start()
+        once()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "status": response.status_code,
+            "p50": percentile(timings, 50),
+            "p95": percentile(timings, 95),
+            "queries": queries,
+            "peak_kib": peak / 1024,
+        }
+
+    def check_budgets(self, endpoint, result, options):
+        failures = []
+        if not 200 <= result["status"] < 300:
+            failures.append(f"{endpoint.name}: HTTP {result['status']}")
+        if endpoint.max_queries is not None and result["queries"] > endpoint.max_queries:
+            failures.append(f"{endpoint.name}: {result['queries']} queries (budget {endpoint.max_queries})")
+        budget = latency_budget(options["scale"], endpoint)
+        if not options["queries_only"] and budget is not None and result["p95"] > budget:
+            failures.append(f"{endpoint.name}: p95 {result['p95']:.1f} ms (budget {budget} ms)")
+        return failures
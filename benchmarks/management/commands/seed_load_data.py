@@ -0,0 +1,140 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from backend.dates import add_months, parse_month
+from benchmarks import datasets, loaddata
+
+USER_EMAIL = "load{index}@load.local"
+
+
+def seed_shard_worker(spec, shard, categories, method, batch_size):
+    # Runs in a child process, which opens its own database connection.
+    return loaddata.seed_shard(spec, shard, categories, method, batch_size)
+
+
+class Command(BaseCommand):
+    """
+    Generate production-scale synthetic data in the configured database.
+
+    Creates users load<N>@load.local (password "load-password"), random and
+    recurring expenses, salary/freelance incomes and per-month category and
+    monthly budgets. The same --seed always yields the same rows, whatever
+    --workers is.
+
+    Usage:
+        python manage.py seed_load_data --users 1000 --expenses-per-user 1000
+        python manage.py seed_load_data --users 5000 --workers 8 --skew 1.2
+        python manage.py seed_load_data --months 36 --end-month 2025-12 --no-recurring
+
+    On PostgreSQL rows are written with COPY FROM STDIN, elsewhere with
+    bulk_create. Users are split into shards processed in parallel.
+    """
+    help = "Seed large volumes of synthetic users, expenses, incomes and budgets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--expenses-per-user", type=int, default=500, help="Average random expenses per user.")
+        parser.add_argument("--months", type=int, default=24)
+        parser.add_argument("--end-month", default=f"{datasets.LAST_MONTH:%Y-%m}", help="Last month (YYYY-MM).")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--skew", type=float, default=1.0, help="0 = uniform; higher concentrates activity.")
+        parser.add_argument("--budget-coverage", type=float, default=0.75)
+        parser.add_argument("--no-recurring", action="store_true", help="Skip rent, bills, subscriptions and salary.")
+        parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument("--method", choices=["auto", "copy", "bulk"], default="auto")
+
+    def handle(self, *args, **options):
+        try:
+            last_month = parse_month(options["end_month"])
+        except ValueError:
+            raise CommandError("--end-month must be YYYY-MM.")
+        if options["users"] < 1 or options["months"] < 1:
+            raise CommandError("--users and --months must be positive.")
+
+        method = options["method"]
+        if method == "auto":
+            method = "copy" if loaddata.supports_copy() else "bulk"
+        elif method == "copy" and not loaddata.supports_copy():
+            raise CommandError("COPY needs PostgreSQL; use --method bulk.")
+
+        workers = max(1, options["workers"])
+        if connection.vendor == "sqlite" and workers > 1:
+            self.stdout.write(self.style.WARNING("SQLite allows one writer at a time; using a single process."))
+            workers = 1
+
+        spec = loaddata.LoadSpec(
+            users=options["users"],
+            expenses_per_user=options["expenses_per_user"],
+            first_month=add_months(last_month, -(options["months"] - 1)),
+            last_month=last_month,
+            seed=options["seed"],
+            skew=options["skew"],
+            recurring=not options["no_recurring"],
+            budget_coverage=options["budget_coverage"],
+        )
+
+        started = time.perf_counter()
+        categories = {key: category.id for key, category in datasets.ensure_categories().items()}
+        user_ids = self.create_users(spec.users)
+        counts = loaddata.expenses_for_users(spec)
+        users = [(index, user_ids[index], counts[index]) for index in range(spec.users)]
+        # Round-robin shards keep the heavy (low-index) users spread over workers.
+        shards = [users[offset::workers] for offset in range(workers) if users[offset::workers]]
+
+        self.stdout.write(
+            f"Seeding {spec.users} users, {spec.first_month:%Y-%m}..{spec.last_month:%Y-%m}, "
+            f"method={method}, workers={len(shards)}, seed={spec.seed}"
+        )
+        if len(shards) == 1:
+            results = [loaddata.seed_shard(spec, shards[0], categories, method, options["batch_size"])]
+        else:
+            # Children must not share the parent's database connection.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+                futures = [
+                    pool.submit(seed_shard_worker, spec, shard, categories, method, options["batch_size"])
+                    for shard in shards
+                ]
+                results = [future.result() for future in futures]
+
+        totals = {}
+        for result in results:
+            for table, count in result.items():
+                totals[table] = totals.get(table, 0) + count
+        elapsed = time.perf_counter() - started
+        rows = sum(totals.values())
+        summary = ", ".join(f"{table}={count}" for table, count in totals.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {rows} rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s): {summary}"
+        ))
+
+    def create_users(self, count):
+        """
+        Create (or reuse) load<index>@load.local users; returns their ids by index.
+        """
+        User = get_user_model()
+        emails = [USER_EMAIL.format(index=index) for index in range(count)]
+        existing = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+        if existing:
+            raise CommandError(
+                f"{len(existing)} load users already exist; delete them first "
+                "(e.g. User.objects.filter(email__endswith='@load.local').delete())."
+            )
+
+        password = make_password("load-password")
+        User.objects.bulk_create(
+            [
+                User(username=f"load{index}", email=email, password=password, is_active=True)
+                for index, email in enumerate(emails)
+            ],
+            batch_size=5000,
+        )
+        ids = dict(User.objects.filter(email__in=emails).values_list("email", "id"))
+        return [ids[email] for email in emails]
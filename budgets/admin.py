@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Budget, MonthlyBudget
+from .models import Budget, BudgetAlert, MonthlyBudget
 
 @admin.register(Budget)
 class BudgetAdmin(admin.ModelAdmin):
@@ -7,6 +7,12 @@ class BudgetAdmin(admin.ModelAdmin):
     list_filter = ('month', 'category')
     search_fields = ('user__email', 'category__name')
 
+@admin.register(BudgetAlert)
+class BudgetAlertAdmin(admin.ModelAdmin):
+    list_display = ('budget', 'threshold', 'spent', 'created_at', 'notified_at')
+    list_filter = ('threshold', 'notified_at')
+    search_fields = ('budget__user__email', 'budget__category__name')
+
 @admin.register(MonthlyBudget)
 class MonthlyBudgetAdmin(admin.ModelAdmin):
     list_display = ('user', 'month', 'amount')
@@ -0,0 +1,70 @@
+from django.db.models import F, Q, Sum, Window
+from django.db.models.functions import RowNumber
+
+from backend.dates import iter_months, next_month_start
+from rollups.models import MonthlyRollup
+from rollups import services as rollups
+from .models import Budget
+
+TOP_OVER_BUDGET = 3
+
+
+def build_analytics(user, first_month, last_month):
+    """
+    Budget analytics for every month from `first_month` to `last_month` (inclusive).
+
+    Runs three queries whatever the number of months or budgets:
+    budget totals per month, spent/income totals per month (rollup table),
+    and the top over-budget categories per month (ranked in the database).
+
+    Returns {month_start_date: {...}} in the shape of the analytics endpoint.
+    """
+    month_range = {'month__gte': first_month, 'month__lt': next_month_start(last_month)}
+    budgets = Budget.objects.filter(user=user, **month_range)
+
+    budget_totals = {
+        row['month']: row['total']
+        for row in budgets.order_by().values('month').annotate(total=Sum('amount'))
+    }
+
+    flows = (
+        MonthlyRollup.objects.filter(user=user, **month_range)
+        .order_by()
+        .values('month')
+        .annotate(
+            spent=Sum('total', filter=Q(kind=MonthlyRollup.KIND_EXPENSE)),
+            income=Sum('total', filter=Q(kind=MonthlyRollup.KIND_INCOME)),
+        )
+    )
+    flows_by_month = {row['month']: row for row in flows}
+
+    over_budget = (
+        rollups.annotate_budget_spent(budgets.select_related('category'))
+        .annotate(excess=F('spent') - F('amount'))
+        .filter(spent__gt=F('amount'))
+        .annotate(rank=Window(RowNumber(), partition_by=[F('month')], order_by=F('excess').desc()))
+        .filter(rank__lte=TOP_OVER_BUDGET)
+        .order_by('month', 'rank')
+    )
+    over_by_month = {}
+    for budget in over_budget:
+        over_by_month.setdefault(budget.month, []).append({
+            "category": budget.category.name,
+            "budget": float(budget.amount),
+            "spent": float(budget.spent),
+            "excess": float(budget.excess),
+        })
+
+    analytics = {}
+    for month in iter_months(first_month, last_month):
+        flow = flows_by_month.get(month, {})
+        total_expense = flow.get('spent') or 0
+        total_income = flow.get('income') or 0
+        analytics[month] = {
+            "total_budget": float(budget_totals.get(month) or 0),
+            "total_spent": float(total_expense),
+            "total_income": float(total_income),
+            "savings": float(total_income - total_expense),
+            "top_over_budget_categories": over_by_month.get(month, []),
+        }
+    return analytics
@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 04:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("budgets", "0006_pendingbudgetupdate"),
+        ("categories", "0002_alter_category_options"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="budget",
+            index=models.Index(fields=["user", "month"], name="budget_user_month_idx"),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-18 04:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("budgets", "0007_budget_budget_user_month_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BudgetAlert",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "threshold",
+                    models.CharField(
+                        choices=[
+                            ("near_limit", "Near limit (80%)"),
+                            ("over_budget", "Over budget"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("spent", models.DecimalField(decimal_places=2, max_digits=14)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "budget",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="alerts",
+                        to="budgets.budget",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("budget", "threshold")},
+            },
+        ),
+    ]
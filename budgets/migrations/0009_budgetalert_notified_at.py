@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+def mark_existing_alerts_notified(apps, schema_editor):
+    # Alerts recorded before this field existed were emailed when created.
+    BudgetAlert = apps.get_model("budgets", "BudgetAlert")
+    BudgetAlert.objects.update(notified_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("budgets", "0008_budgetalert"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="budgetalert",
+            name="notified_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_existing_alerts_notified, migrations.RunPython.noop),
+    ]
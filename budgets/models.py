@@ -15,6 +15,9 @@ class Budget(models.Model):
     class Meta:
         unique_together = ('user', 'category', 'month')
         verbose_name_plural = "Budgets"
+        indexes = [
+            models.Index(fields=['user', 'month'], name='budget_user_month_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email} | {self.category.name} | {self.month.strftime('%B %Y')} → ₹{self.amount}"
@@ -32,6 +35,33 @@ class MonthlyBudget(models.Model):
     def __str__(self):
         return f"{self.user.email} | {self.month.strftime('%B %Y')} → ₹{self.amount}"
 
+class BudgetAlert(models.Model):
+    """
+    Records that a budget threshold was reached, so each threshold
+    fires at most once per budget (i.e. once per category and month).
+    `notified_at` is set once the alert has been emailed, either right away
+    or in the user's daily digest (BUDGET_ALERT_DIGEST).
+    """
+    NEAR_LIMIT = 'near_limit'
+    OVER_BUDGET = 'over_budget'
+    THRESHOLD_CHOICES = [
+        (NEAR_LIMIT, 'Near limit (80%)'),
+        (OVER_BUDGET, 'Over budget'),
+    ]
+
+    budget = models.ForeignKey(Budget, on_delete=models.CASCADE, related_name="alerts")
+    threshold = models.CharField(max_length=20, choices=THRESHOLD_CHOICES)
+    spent = models.DecimalField(max_digits=14, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('budget', 'threshold')
+
+    def __str__(self):
+        return f"{self.budget} | {self.threshold} at ₹{self.spent}"
+
+
 class PendingBudgetUpdate(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     original_budget = models.ForeignKey(Budget, on_delete=models.CASCADE)
@@ -0,0 +1,157 @@
+# budgets/tasks.py
+
+from datetime import date
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from outbox.services import enqueue
+from rollups.models import MonthlyRollup
+from rollups import services as rollups
+from users.tasks import build_message, deliver, queue_email
+from .models import Budget, BudgetAlert
+
+NEAR_LIMIT_RATIO = 0.8
+
+
+def pending_check_key(user_id, category_id, month):
+    return f"budget-check:{user_id}:{category_id}:{month:%Y-%m}"
+
+
+def schedule_budget_check(user_id, category_id, month):
+    """
+    Queue a threshold evaluation for (user, category, month) through the
+    outbox, in the current transaction.
+
+    Evaluations are debounced: the first expense in a burst schedules a task
+    BUDGET_CHECK_DELAY seconds out and later ones are merged into it while it
+    is still pending, so a burst of expenses costs a single evaluation.
+    """
+    month = month.replace(day=1)
+    enqueue(
+        evaluate_budget_thresholds,
+        args=[user_id, category_id, month.isoformat()],
+        delay=settings.BUDGET_CHECK_DELAY,
+        dedupe_key=pending_check_key(user_id, category_id, month),
+    )
+
+
+def threshold_reached(spent, budget_amount):
+    """
+    Highest threshold reached by `spent`, or None.
+    Mirrors the status labels used by the budget summary.
+    """
+    if spent > budget_amount:
+        return BudgetAlert.OVER_BUDGET
+    if spent >= NEAR_LIMIT_RATIO * float(budget_amount):
+        return BudgetAlert.NEAR_LIMIT
+    return None
+
+
+def build_alert_message(threshold, budget, spent):
+    category = budget.category.name
+    month_name = budget.month.strftime('%B')
+    budget_amount = float(budget.amount)
+
+    if threshold == BudgetAlert.OVER_BUDGET:
+        subject = "❗ Budget Overspent"
+        message = f"You have exceeded your budget for {category} in {month_name}. Limit: ₹{budget_amount}, Spent: ₹{spent}"
+    else:
+        subject = "⚠️ Budget Near Limit"
+        message = f"You've spent over 80% of your {category} budget for {month_name}. Limit: ₹{budget_amount}, Spent: ₹{spent}"
+    return subject, message
+
+
+@shared_task
+def evaluate_budget_thresholds(user_id, category_id, month):
+    """
+    Compare a month's spending in one category with its budget and send an
+    alert for each threshold that is reached for the first time.
+    """
+    month = date.fromisoformat(month)
+
+    budget = (
+        Budget.objects.select_related('user', 'category')
+        .filter(user_id=user_id, category_id=category_id, month=month)
+        .first()
+    )
+    if budget is None:
+        return
+
+    spent = rollups.category_total(budget.user, category_id, MonthlyRollup.KIND_EXPENSE, month)
+    threshold = threshold_reached(spent, budget.amount)
+    if threshold is None:
+        return
+
+    alert, _ = BudgetAlert.objects.get_or_create(
+        budget=budget,
+        threshold=threshold,
+        defaults={'spent': spent},
+    )
+    if settings.BUDGET_ALERT_DIGEST:
+        # In digest mode the alert goes out with send_budget_alert_digests.
+        return
+
+    # Whether to send is decided by notified_at, not by whether the alert was
+    # just created: claiming it and queueing the email commit together, so an
+    # alert whose email could not be queued is retried by the next evaluation,
+    # and concurrent evaluations cannot both send it.
+    with transaction.atomic():
+        claimed = (
+            BudgetAlert.objects.filter(pk=alert.pk, notified_at__isnull=True)
+            .update(notified_at=timezone.now())
+        )
+        if not claimed:
+            return
+        # Queued rather than sent here, so a burst of alerts shares SMTP connections.
+        subject, message = build_alert_message(threshold, budget, spent)
+        queue_email(budget.user.email, subject, message)
+
+
+def build_digest_message(user, alerts):
+    """
+    One email listing every pending alert of a user.
+    """
+    parts = [build_alert_message(alert.threshold, alert.budget, alert.spent) for alert in alerts]
+    if len(parts) == 1:
+        subject, message = parts[0]
+        return build_message(user.email, subject, message)
+    return build_message(user.email, "📊 Your daily budget alerts", "\n".join(message for _, message in parts))
+
+
+@shared_task
+def send_budget_alert_digests():
+    """
+    Fold each user's un-notified budget alerts into a single email and send
+    all digests over reused SMTP connections. Scheduled daily by Celery beat;
+    only finds work when BUDGET_ALERT_DIGEST is enabled.
+
+    Alerts are claimed (notified_at set) before anything is sent, so a digest
+    is never sent twice; the alerts of a digest that could not be sent are
+    released again for the next run.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        alerts = list(
+            BudgetAlert.objects.filter(notified_at__isnull=True)
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('budget__user', 'budget__category')
+            .order_by('budget__user_id', 'budget__month', 'id')
+        )
+        BudgetAlert.objects.filter(pk__in=[alert.pk for alert in alerts]).update(notified_at=now)
+
+    by_user = {}
+    for alert in alerts:
+        by_user.setdefault(alert.budget.user, []).append(alert)
+    if not by_user:
+        return 0
+
+    digests = {build_digest_message(user, user_alerts): user_alerts for user, user_alerts in by_user.items()}
+    failed = deliver(list(digests))
+    if failed:
+        BudgetAlert.objects.filter(
+            pk__in=[alert.pk for message in failed for alert in digests[message]], notified_at=now,
+        ).update(notified_at=None)
+    return len(digests) - len(failed)
@@ -1,3 +1,65 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from backend.testing import QueryCountAssertionsMixin
+from categories.models import Category
+from expenses.models import Expense
+from incomes.models import Income
+from .models import Budget, MonthlyBudget
+
+
+class BudgetQueryCountTests(QueryCountAssertionsMixin, APITestCase):
+    """
+    Budget list, summary and analytics endpoints must run the same number of
+    queries for 1 budget as for 50: a difference means an N+1.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        cls.salary = Category.objects.create(name="Salary", type="income")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def grow(self, size):
+        """
+        Bring the user up to `size` categories, each with a budget and an
+        expense in March 2025 and a monthly budget for one month of the range.
+        """
+        for index in range(Budget.objects.filter(user=self.user).count(), size):
+            category = Category.objects.create(name=f"Budget category {index}", type="expense")
+            Budget.objects.create(user=self.user, category=category, month=date(2025, 3, 1), amount=100)
+            Expense.objects.create(
+                user=self.user, title=f"Expense {index}", amount=10 * index,
+                date=date(2025, 3, 1 + index % 28), category=category,
+            )
+            Income.objects.create(
+                user=self.user, title=f"Income {index}", amount=50,
+                date=date(2025, 3, 1), category=self.salary,
+            )
+            MonthlyBudget.objects.create(
+                user=self.user, month=date(2020 + index // 12, 1 + index % 12, 1), amount=500,
+            )
+
+    def test_list(self):
+        self.assertQueriesConstant("/api/budgets/", self.grow, expected=1)
+
+    def test_by_month(self):
+        self.assertQueriesConstant("/api/budgets/by-month/?month=2025-03", self.grow, expected=1)
+
+    def test_summary(self):
+        self.assertQueriesConstant("/api/budgets/summary/?month=2025-03", self.grow, expected=1)
+
+    def test_analytics_month(self):
+        self.assertQueriesConstant("/api/budgets/analytics/?month=2025-03", self.grow, expected=3)
+
+    def test_analytics_range(self):
+        self.assertQueriesConstant("/api/budgets/analytics/?from=2025-01&to=2025-03", self.grow, expected=3)
+
+    def test_monthly_budget_list(self):
+        self.assertQueriesConstant("/api/budgets/monthlybudgets/", self.grow, expected=1)
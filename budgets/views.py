@@ -1,13 +1,17 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Sum
-from datetime import datetime
+from datetime import date, datetime
 from .models import Budget, MonthlyBudget,PendingBudgetUpdate
 from .serializers import BudgetSerializer, MonthlyBudgetSerializer
-from expenses.models import Expense
-from incomes.models import Income
-from users.tasks import send_budget_alert_email
+from rollups import services as rollups
+from users.tasks import queue_email
+from .tasks import schedule_budget_check
+from django.db import transaction
+from .analytics import build_analytics
+from backend.dates import month_window
+from backend.pagination import KeysetPagination
+from apicache.decorators import cached_response, etag_response
 import uuid
 from rest_framework.decorators import api_view, permission_classes
 
@@ -19,18 +23,29 @@ class BudgetViewSet(viewsets.ModelViewSet):
     queryset = Budget.objects.all()
     serializer_class = BudgetSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-month', '-id')
 
     def get_queryset(self):
-        return Budget.objects.filter(user=self.request.user).order_by('-month')
+        # BudgetSerializer.category_name reads category.name for every row
+        return Budget.objects.filter(user=self.request.user).select_related('category').order_by('-month')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @etag_response('budget_list')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @action(detail=False, methods=['get'], url_path='summary')
+    @etag_response('budget_summary')
+    @cached_response('budget_summary')
     def budget_summary(self, request):
         """
         Returns a summary of budget vs actual expenses per category for a given month.
         Query param: ?month=YYYY-MM
+        Served by one query: budgets joined to their category, with the month's
+        spending annotated from the rollup table.
         """
         month_param = request.query_params.get('month')
         if not month_param:
@@ -41,18 +56,13 @@ class BudgetViewSet(viewsets.ModelViewSet):
         except ValueError:
             return Response({"error": "Invalid month format. Use YYYY-MM."}, status=400)
 
-        budgets = Budget.objects.filter(user=request.user, month=month_start)
+        budgets = rollups.annotate_budget_spent(
+            Budget.objects.filter(user=request.user, month=month_start).select_related('category')
+        )
         results = []
 
         for budget in budgets:
-            expenses = Expense.objects.filter(
-                user=request.user,
-                category=budget.category,
-                date__year=month_start.year,
-                date__month=month_start.month
-            )
-            spent = expenses.aggregate(total=Sum('amount'))['total'] or 0
-            spent = float(spent)
+            spent = float(budget.spent)
             budget_amount = float(budget.amount)
 
             remaining = round(budget_amount - spent, 2)
@@ -99,58 +109,51 @@ class BudgetViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        budgets = Budget.objects.filter(user=request.user, month=month_start)
+        budgets = self.get_queryset().filter(month=month_start)
         serializer = BudgetSerializer(budgets, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='analytics')
+    @etag_response('get_analytics')
+    @cached_response('get_analytics')
     def get_analytics(self, request):
         """
         Returns high-level analytics for the selected month:
         - total budget, total spent, total income
         - savings (income - spent)
         - top 3 over-budget categories
+
+        Query params:
+            ?month=YYYY-MM             → one month (default: current month)
+            ?from=YYYY-MM&to=YYYY-MM   → a list with the analytics of every
+                                         month in the range, oldest first
+        Either way the response costs the same fixed number of queries.
         """
         user = request.user
         month_param = request.query_params.get("month")
 
+        if request.query_params.get("from") or request.query_params.get("to"):
+            try:
+                first_month, last_month = month_window(request.query_params, date.today())
+            except ValueError as exc:
+                return Response({"error": str(exc)}, status=400)
+
+            analytics = build_analytics(user, first_month, last_month)
+            return Response([
+                {"month": month.strftime("%Y-%m"), **values}
+                for month, values in analytics.items()
+            ])
+
         try:
             if month_param:
                 month_start = datetime.strptime(month_param, "%Y-%m").date().replace(day=1)
             else:
-                month_start = datetime.today().replace(day=1)
+                month_start = date.today().replace(day=1)
         except ValueError:
             return Response({"error": "Invalid month format. Use YYYY-MM."}, status=400)
 
-        budgets = Budget.objects.filter(user=user, month=month_start)
-        expenses = Expense.objects.filter(user=user, date__year=month_start.year, date__month=month_start.month)
-        incomes = Income.objects.filter(user=user, date__year=month_start.year, date__month=month_start.month)
-
-        total_budget = budgets.aggregate(total=Sum('amount'))['total'] or 0
-        total_expense = expenses.aggregate(total=Sum('amount'))['total'] or 0
-        total_income = incomes.aggregate(total=Sum('amount'))['total'] or 0
-
-        over_budget = []
-        for budget in budgets:
-            cat_exp = expenses.filter(category=budget.category).aggregate(sum=Sum('amount'))['sum'] or 0
-            if cat_exp > budget.amount:
-                over_budget.append({
-                    "category": budget.category.name,
-                    "budget": float(budget.amount),
-                    "spent": float(cat_exp),
-                    "excess": float(cat_exp - budget.amount)
-                })
-
-        top_over_budget = sorted(over_budget, key=lambda x: x['excess'], reverse=True)[:3]
+        return Response(build_analytics(user, month_start, month_start)[month_start])
 
-        return Response({
-            "total_budget": float(total_budget),
-            "total_spent": float(total_expense),
-            "total_income": float(total_income),
-            "savings": float(total_income - total_expense),
-            "top_over_budget_categories": top_over_budget,
-        })
-    
     def update(self, request, *args, **kwargs):
         budget_instance = self.get_object()
         new_amount = request.data.get("amount")
@@ -161,14 +164,6 @@ class BudgetViewSet(viewsets.ModelViewSet):
         # Create secure token
         token = uuid.uuid4().hex
 
-        # Save to pending table
-        pending = PendingBudgetUpdate.objects.create(
-            user=request.user,
-            original_budget=budget_instance,
-            proposed_amount=new_amount,
-            token=token
-        )
-
         # Generate confirm and deny URLs
         confirm_url = f"http://localhost:8000/api/budgets/confirm/{token}/"
         deny_url = f"http://localhost:8000/api/budgets/reject/{token}/"
@@ -182,7 +177,15 @@ class BudgetViewSet(viewsets.ModelViewSet):
             "This link will expire in 30 minutes."
         )
 
-        send_budget_alert_email.delay(request.user.email, subject, message)
+        with transaction.atomic():
+            # Save to pending table
+            pending = PendingBudgetUpdate.objects.create(
+                user=request.user,
+                original_budget=budget_instance,
+                proposed_amount=new_amount,
+                token=token
+            )
+            queue_email(request.user.email, subject, message)
 
         return Response({
             "message": "Budget update pending. Please confirm via email.",
@@ -190,7 +193,6 @@ class BudgetViewSet(viewsets.ModelViewSet):
         }, status=202)
 
 
-
 class MonthlyBudgetViewSet(viewsets.ModelViewSet):
     """
     ViewSet to manage the overall monthly budget cap.
@@ -198,6 +200,8 @@ class MonthlyBudgetViewSet(viewsets.ModelViewSet):
     queryset = MonthlyBudget.objects.all()
     serializer_class = MonthlyBudgetSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-month', '-id')
 
     def get_queryset(self):
         if self.request.user and self.request.user.is_authenticated:
@@ -207,6 +211,10 @@ class MonthlyBudgetViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @etag_response('monthly_budget_list')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 from rest_framework.decorators import api_view
 from django.shortcuts import get_object_or_404
@@ -217,21 +225,27 @@ from rest_framework import status
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])  
 def confirm_budget_update(request, token):
-    pending = get_object_or_404(PendingBudgetUpdate, token=token)
+    with transaction.atomic():
+        # Locked so two clicks on the link cannot both apply the update.
+        pending = get_object_or_404(PendingBudgetUpdate.objects.select_for_update(), token=token)
+
+        if pending.is_expired():
+            pending.delete()
+            return Response({"detail": "Link expired. Budget update cancelled."}, status=400)
 
-    if pending.is_expired():
-        pending.delete()
-        return Response({"detail": "Link expired. Budget update cancelled."}, status=400)
+        if pending.is_confirmed:
+            return Response({"detail": "This update has already been confirmed."}, status=200)
 
-    if pending.is_confirmed:
-        return Response({"detail": "This update has already been confirmed."}, status=200)
+        budget = pending.original_budget
+        budget.amount = pending.proposed_amount
+        budget.save()
 
-    budget = pending.original_budget
-    budget.amount = pending.proposed_amount
-    budget.save()
+        # The limit changed, so thresholds may fire again against the new amount.
+        budget.alerts.all().delete()
+        schedule_budget_check(budget.user_id, budget.category_id, budget.month)
 
-    pending.is_confirmed = True
-    pending.save()
+        pending.is_confirmed = True
+        pending.save()
 
     return Response({"detail": "✅ Budget update confirmed successfully!"}, status=200)
 
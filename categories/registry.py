@@ -0,0 +1,109 @@
+"""
+Per-process cache of the Category table.
+
+Categories are few and almost never change, so every process keeps them in
+memory instead of querying on each request. A version number in the shared
+cache is bumped whenever a category is saved or deleted; each process
+compares it with the version it loaded and reloads when they differ.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Category
+
+VERSION_KEY = "categories:registry:version"
+
+# (version, CategoryRegistry) loaded by this process; swapped as a whole.
+_loaded = (None, None)
+
+
+class CategoryRegistry:
+    """
+    Immutable snapshot of the Category table.
+
+    by_id:   id -> Category
+    by_name: (type, lowercased name) -> id; the lowest id wins on duplicates.
+
+    The Category instances are shared across requests and must not be modified.
+    """
+
+    def __init__(self, categories):
+        self.by_id = {}
+        self.by_name = {}
+        for category in sorted(categories, key=lambda c: c.id):
+            self.by_id[category.id] = category
+            self.by_name.setdefault((category.type, category.name.lower()), category.id)
+
+    def get(self, pk):
+        return self.by_id.get(pk)
+
+    def lookup(self, type, name):
+        """
+        Category of `type` named `name` (case-insensitive), or None.
+        """
+        pk = self.by_name.get((type, name.lower()))
+        return self.by_id.get(pk)
+
+    def of_type(self, type=None):
+        """
+        Categories of one type (all categories when type is None), by id.
+        """
+        return [c for c in self.by_id.values() if type is None or c.type == type]
+
+    def ids_named(self, name):
+        """
+        Ids of every category called `name` (case-insensitive), of any type.
+        """
+        name = name.lower()
+        return [c.id for c in self.by_id.values() if c.name.lower() == name]
+
+    def names_of_type(self, type):
+        """
+        Lowercased name -> Category for every category of `type`; the lowest
+        id wins on duplicates, as in lookup().
+        """
+        return {name: self.by_id[pk] for (category_type, name), pk in self.by_name.items() if category_type == type}
+
+
+def _shared_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a version lost to eviction never repeats an old one.
+        cache.add(VERSION_KEY, time.time_ns() // 1000, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_registry():
+    """
+    Current CategoryRegistry. Costs one cache read; the database is only
+    queried after a category changed (in any process).
+    """
+    global _loaded
+    version = _shared_version()
+    loaded_version, registry = _loaded
+    if registry is None or loaded_version != version:
+        registry = CategoryRegistry(Category.objects.all())
+        _loaded = (version, registry)
+    return registry
+
+
+def _bump():
+    global _loaded
+    _loaded = (None, None)
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        _shared_version()
+
+
+def invalidate():
+    """
+    Drop this process's copy now and tell every process to reload once the
+    current transaction commits.
+    """
+    global _loaded
+    _loaded = (None, None)
+    transaction.on_commit(_bump)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Category
+from .registry import get_registry
 
 class CategorySerializer(serializers.ModelSerializer):
     """
@@ -9,4 +10,23 @@ class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'type']
-        ref_name = 'CategorySerializerCategory'  # Unique name
\ No newline at end of file
+        ref_name = 'CategorySerializerCategory'  # Unique name
+
+
+class CategoryPrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that resolves the id through the category
+    registry instead of querying the Category table.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        category = get_registry().get(pk)
+        if category is None:
+            self.fail('does_not_exist', pk_value=data)
+        return category
@@ -2,6 +2,7 @@ from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from .models import Category
 from .serializers import CategorySerializer
+from .registry import get_registry
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -21,17 +22,13 @@ class CategoryListAPIView(generics.ListAPIView):
         GET /api/categories/?type=expense → Only expense categories
     """
     def get_queryset(self):
-        return Category.objects.all()
-
-    def get_queryset(self):
+        # Served from the in-process category registry, without a query.
         category_type = self.request.query_params.get('type')
-        
-        if category_type:
-            # lowered = category_type.lower()
-            if category_type in ['expense', 'income']:
-                return Category.objects.filter(type__iexact=category_type)
-        
-        return Category.objects.all()
+
+        if category_type in ['expense', 'income']:
+            return get_registry().of_type(category_type)
+
+        return get_registry().of_type()
 
 
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Expense
+from .models import Expense, ImportJob
 from categories.models import Category
 
 
@@ -16,3 +16,10 @@ class ExpenseAdmin(admin.ModelAdmin):
 
 
 admin.site.register(Expense, ExpenseAdmin)
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'original_name', 'status', 'rows_imported', 'rows_failed', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('user__email', 'original_name')
@@ -0,0 +1,168 @@
+import codecs
+import csv
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import transaction
+
+from apicache.services import invalidate_user
+from categories.registry import get_registry
+from rollups.models import MonthlyRollup
+from rollups.services import record_instances
+from .models import Expense
+
+REQUIRED_FIELDS = {"title", "amount", "date", "category"}
+DEFAULT_BATCH_SIZE = 1000
+
+
+class CSVHeaderError(ValueError):
+    """
+    Raised when the uploaded CSV is missing one of the required columns.
+    """
+
+
+def get_batch_size():
+    return getattr(settings, "EXPENSE_IMPORT_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+
+
+def iter_csv_rows(uploaded_file, encoding="utf-8"):
+    """
+    Lazily decode an uploaded file into csv.DictReader rows.
+
+    Iterating a Django File yields lines chunk by chunk, so only the
+    current chunk is ever held in memory regardless of file size.
+    """
+    reader = csv.DictReader(codecs.iterdecode(uploaded_file, encoding))
+    if reader.fieldnames is not None and not REQUIRED_FIELDS.issubset(reader.fieldnames):
+        raise CSVHeaderError("CSV header must include title, amount, date, category")
+    return reader
+
+
+def load_expense_categories():
+    """
+    Map lowercased category name -> Category for every expense category,
+    taken from the category registry (no query per row, usually none at all).
+    """
+    return get_registry().names_of_type("expense")
+
+
+def parse_amount(value):
+    """
+    Parse a non-negative amount with at most two decimal places
+    (e.g. "2000" or "12.50"); returns None if invalid.
+    """
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        return None
+    if not amount.is_finite() or amount < 0 or amount.as_tuple().exponent < -2:
+        return None
+    if amount >= Decimal("1e8"):  # Expense.amount is max_digits=10, decimal_places=2
+        return None
+    return amount
+
+
+def build_expense(row, user, categories):
+    """
+    Validate a single CSV row.
+    Returns (Expense, []) when the row is valid, otherwise (None, errors).
+    """
+    row_errors = []
+
+    title = (row.get("title") or "").strip()
+    amount = (row.get("amount") or "").strip()
+    date = (row.get("date") or "").strip()
+    category_name = (row.get("category") or "").strip()
+    notes = (row.get("notes") or "").strip()
+
+    if not title:
+        row_errors.append("Missing title")
+    amount = parse_amount(amount)
+    if amount is None:
+        row_errors.append("Invalid or missing amount")
+    if not date:
+        row_errors.append("Missing date")
+    else:
+        try:
+            date = datetime.strptime(date, "%Y-%m-%d").date()
+        except ValueError:
+            row_errors.append("Invalid date format. Use YYYY-MM-DD.")
+
+    category = categories.get(category_name.lower())
+    if category is None:
+        row_errors.append(f"Category '{category_name}' not found")
+
+    if row_errors:
+        return None, row_errors
+
+    return Expense(
+        title=title,
+        amount=amount,
+        date=date,
+        category=category,
+        notes=notes,
+        user=user,
+    ), []
+
+
+def insert_expenses(expenses, user_id, batch_size=None):
+    """
+    bulk_create `expenses` (all owned by `user_id`) in one transaction.
+    bulk_create sends no model signals, so the rollup table and the user's
+    response cache are updated here.
+    """
+    with transaction.atomic():
+        created = Expense.objects.bulk_create(expenses, batch_size=batch_size or get_batch_size())
+        record_instances(MonthlyRollup.KIND_EXPENSE, created)
+        invalidate_user(user_id)
+    return created
+
+
+def import_expenses(rows, user, batch_size=None, on_batch=None):
+    """
+    Insert expenses from an iterable of CSV rows using batched bulk_create.
+
+    Rows are numbered from 2 (the header is line 1) in the returned errors,
+    matching what the upload endpoint has always reported.
+    `on_batch(success_count, errors)` is called after each flushed batch.
+
+    Returns (success_count, errors).
+    """
+    batch_size = batch_size or get_batch_size()
+    categories = load_expense_categories()
+    success_count = 0
+    errors = []
+    pending = []
+
+    def flush():
+        nonlocal success_count
+        if pending:
+            insert_expenses(pending, user.id, batch_size=batch_size)
+            success_count += len(pending)
+            pending.clear()
+        if on_batch is not None:
+            on_batch(success_count, errors)
+
+    for line_number, row in enumerate(rows, start=2):
+        expense, row_errors = build_expense(row, user, categories)
+        if row_errors:
+            errors.append({"row": line_number, "errors": row_errors})
+            continue
+
+        pending.append(expense)
+        if len(pending) >= batch_size:
+            flush()
+
+    flush()
+    return success_count, errors
+
+
+def import_expenses_csv(uploaded_file, user, batch_size=None):
+    """
+    Stream an uploaded CSV file into the Expense table in one transaction.
+    Raises CSVHeaderError if the header is missing required columns.
+    """
+    rows = iter_csv_rows(uploaded_file)
+    with transaction.atomic():
+        return import_expenses(rows, user, batch_size=batch_size)
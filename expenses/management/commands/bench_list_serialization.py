@@ -0,0 +1,84 @@
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from categories.models import Category
+from expenses.models import Expense
+from expenses.serializers import ExpenseSerializer, expense_rows
+from incomes.models import Income
+from incomes.serializers import IncomeSerializer, income_rows
+
+
+class Command(BaseCommand):
+    """
+    Compare per-row cost of ModelSerializer output with the `.values()` read
+    path used by the expense and income list endpoints.
+
+    Rows are built in memory, so only serialization is measured (no database).
+    The command also fails if the two paths produce different output.
+
+    Usage:
+        python manage.py bench_list_serialization --rows 20000 --repeat 5
+    """
+    help = "Benchmark ExpenseSerializer/IncomeSerializer against the lean list row builders."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def build_data(self, model, rows):
+        categories = [Category(id=i, name=f"Category {i}", type="expense") for i in range(1, 11)]
+        created = datetime(2025, 4, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc)
+        instances, values = [], []
+        for i in range(rows):
+            category = categories[i % len(categories)] if model is Expense or i % 7 else None
+            fields = {
+                "id": i + 1,
+                "title": f"Item {i}",
+                "amount": Decimal(i % 5000) + Decimal("0.25"),
+                "date": date(2025, 1, 1) + timedelta(days=i % 365),
+                "notes": "note" if i % 3 else None,
+                "user_id": 1,
+                "created_at": created + timedelta(seconds=i),
+            }
+            instances.append(model(category=category, **fields))
+            values.append({
+                **fields,
+                "category_id": category.id if category else None,
+                "category__name": category.name if category else None,
+            })
+        return instances, values
+
+    def best_of(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        return min(timings), result
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        if rows < 1:
+            raise CommandError("--rows must be positive.")
+
+        cases = [
+            ("expenses", Expense, ExpenseSerializer, expense_rows),
+            ("incomes", Income, IncomeSerializer, income_rows),
+        ]
+        for label, model, serializer_class, row_builder in cases:
+            instances, values = self.build_data(model, rows)
+
+            slow, expected = self.best_of(lambda: serializer_class(instances, many=True).data, repeat)
+            fast, actual = self.best_of(lambda: row_builder(values), repeat)
+
+            if [dict(item) for item in expected] != actual:
+                raise CommandError(f"{label}: lean rows differ from {serializer_class.__name__} output.")
+
+            self.stdout.write(
+                f"{label:<9} {serializer_class.__name__:<18} {slow / rows * 1e6:7.2f} µs/row   "
+                f"lean rows {fast / rows * 1e6:6.2f} µs/row   "
+                + self.style.SUCCESS(f"{slow / fast:4.1f}x faster")
+            )
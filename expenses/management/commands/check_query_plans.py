@@ -0,0 +1,84 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from backend.dates import month_filter
+from expenses.models import Expense
+from incomes.models import Income
+
+
+class Command(BaseCommand):
+    """
+    EXPLAIN the per-user month queries used by the summary endpoints and
+    verify that each one is served by the expected composite index.
+
+    On PostgreSQL sequential scans are disabled for the duration of the check,
+    so the result reflects whether an index *can* be used rather than what the
+    planner prefers on a small development table.
+
+    Usage:
+        python manage.py check_query_plans
+        python manage.py check_query_plans --user 42 --month 2025-04 --verbose-plans
+    """
+    help = "Verify that per-user month queries use the composite (user, date) indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, default=1, help="User id to plan the queries for.")
+        parser.add_argument("--category", type=int, default=1, help="Category id for per-category queries.")
+        parser.add_argument("--month", default=None, help="Month to plan for (YYYY-MM). Defaults to the current month.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the full plan for every query.")
+
+    def get_checks(self, user_id, category_id, month):
+        return [
+            (
+                "expenses in month",
+                Expense.objects.filter(user_id=user_id, **month_filter(month)),
+                {"expense_user_date_idx", "expense_user_cat_date_idx"},
+            ),
+            (
+                "expenses in month for category",
+                Expense.objects.filter(user_id=user_id, category_id=category_id, **month_filter(month)),
+                {"expense_user_cat_date_idx"},
+            ),
+            (
+                "incomes in month",
+                Income.objects.filter(user_id=user_id, **month_filter(month)),
+                {"income_user_date_idx", "income_user_cat_date_idx"},
+            ),
+            (
+                "incomes in month for category",
+                Income.objects.filter(user_id=user_id, category_id=category_id, **month_filter(month)),
+                {"income_user_cat_date_idx"},
+            ),
+        ]
+
+    def handle(self, *args, **options):
+        if options["month"]:
+            try:
+                year, month_number = (int(part) for part in options["month"].split("-"))
+                month = date(year, month_number, 1)
+            except ValueError:
+                raise CommandError("Invalid month format. Use YYYY-MM.")
+        else:
+            month = date.today().replace(day=1)
+
+        failures = []
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for label, queryset, expected in self.get_checks(options["user"], options["category"], month):
+                plan = queryset.explain()
+                used = sorted(name for name in expected if name in plan)
+                if used:
+                    self.stdout.write(self.style.SUCCESS(f"OK    {label}: {', '.join(used)}"))
+                else:
+                    failures.append(label)
+                    self.stdout.write(self.style.ERROR(f"FAIL  {label}: none of {', '.join(sorted(expected))}"))
+                if options["verbose_plans"] or not used:
+                    self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f"{len(failures)} query plan(s) did not use the expected index.")
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 04:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0002_alter_category_options"),
+        ("expenses", "0003_importjob"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(fields=["user", "date"], name="expense_user_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(
+                fields=["user", "category", "date"], name="expense_user_cat_date_idx"
+            ),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from categories.models import Category
 
@@ -21,5 +21,63 @@ class Expense(models.Model):
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Per-user time-range queries (month summaries, budget checks) seek on these.
+        indexes = [
+            models.Index(fields=['user', 'date'], name='expense_user_date_idx'),
+            models.Index(fields=['user', 'category', 'date'], name='expense_user_cat_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} - ₹{self.amount} by {self.user.email}"
+
+    def save(self, *args, **kwargs):
+        # The rollup signals lock and read the stored row in pre_save and apply
+        # the difference in post_save; one transaction holds that lock until the
+        # rollup is updated, so concurrent edits cannot both move the old amount.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class ImportJob(models.Model):
+    """
+    Background CSV import of expenses for a user.
+
+    The uploaded file is spooled to storage and processed in batches by the
+    `process_import_job` Celery task, which keeps the counters below current
+    so clients can poll for progress.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='import_jobs')
+    file = models.FileField(upload_to='expense_imports/', blank=True)
+    original_name = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_imported = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    error_report = models.FileField(upload_to='expense_imports/errors/', blank=True)
+    error_message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed after every committed batch; a running job whose heartbeat is
+    # older than EXPENSE_IMPORT_STALE_AFTER is presumed lost with its worker.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Import #{self.pk} ({self.status}) by {self.user.email}"
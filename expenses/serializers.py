@@ -1,5 +1,8 @@
 from rest_framework import serializers
-from .models import Expense, Category
+from django.urls import reverse
+from django.utils import timezone
+from categories.serializers import CategoryPrimaryKeyField
+from .models import Expense, Category, ImportJob
 
 class CategorySerializer(serializers.ModelSerializer):
     """
@@ -20,7 +23,7 @@ class ExpenseSerializer(serializers.ModelSerializer):
     - Automatically assigns the logged-in user on creation
     """
     category = CategorySerializer(read_only=True)  # Shown in GET responses
-    category_id = serializers.PrimaryKeyRelatedField(
+    category_id = CategoryPrimaryKeyField(
         queryset=Category.objects.all(),
         write_only=True,
         source='category'
@@ -48,3 +51,66 @@ class ExpenseSerializer(serializers.ModelSerializer):
         """
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
+
+
+# Columns fetched with .values() for the read-only list path (see expense_rows).
+EXPENSE_ROW_FIELDS = (
+    'id', 'title', 'amount', 'category_id', 'category__name',
+    'date', 'notes', 'user_id', 'created_at',
+)
+
+
+def format_datetime(value, tz):
+    """
+    Format a datetime the way DRF's DateTimeField does (ISO 8601, 'Z' for UTC).
+    """
+    value = value.astimezone(tz).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def expense_rows(rows):
+    """
+    Build ExpenseSerializer-compatible output straight from `.values(*EXPENSE_ROW_FIELDS)`
+    rows, skipping per-row serializer instantiation. Read-only: writes still go
+    through ExpenseSerializer.
+    """
+    tz = timezone.get_current_timezone()
+    return [
+        {
+            'id': row['id'],
+            'title': row['title'],
+            'amount': f"{row['amount']:.2f}",
+            'category': {'id': row['category_id'], 'name': row['category__name']},
+            'date': row['date'].isoformat(),
+            'notes': row['notes'],
+            'user': row['user_id'],
+            'created_at': format_datetime(row['created_at'], tz),
+        }
+        for row in rows
+    ]
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """
+    Read-only representation of a background CSV import job.
+    Exposes progress counters and a link to the error report once available.
+    """
+    error_report_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'original_name', 'status', 'rows_processed', 'rows_imported',
+            'rows_failed', 'error_message', 'error_report_url',
+            'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+    def get_error_report_url(self, obj):
+        if not obj.error_report:
+            return None
+        url = reverse('expense-import-job-errors', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,126 @@
+# expenses/tasks.py
+
+import csv
+import io
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import Q
+from django.utils import timezone
+
+from .importers import CSVHeaderError, import_expenses, iter_csv_rows
+from .models import ImportJob
+
+
+def build_error_report(errors):
+    """
+    Render the per-row import errors as a CSV document.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["row", "errors"])
+    for item in errors:
+        writer.writerow([item["row"], "; ".join(item["errors"])])
+    return buffer.getvalue()
+
+
+def mark_failed(job, message):
+    ImportJob.objects.filter(pk=job.pk).update(
+        status=ImportJob.STATUS_FAILED,
+        error_message=message,
+        finished_at=timezone.now(),
+    )
+
+
+def stale_jobs():
+    """
+    Jobs presumed lost, older than EXPENSE_IMPORT_STALE_AFTER seconds: running
+    jobs whose worker stopped reporting progress (crashed or killed), and
+    pending jobs no worker ever picked up (lost task message).
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.EXPENSE_IMPORT_STALE_AFTER)
+    running = Q(status=ImportJob.STATUS_RUNNING) & (
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    )
+    pending = Q(status=ImportJob.STATUS_PENDING, created_at__lt=cutoff)
+    return ImportJob.objects.filter(running | pending)
+
+
+def fail_stale_jobs(jobs=None):
+    """
+    Mark stale jobs failed so they stop counting against
+    EXPENSE_IMPORT_MAX_ACTIVE_JOBS. Returns the number of jobs failed.
+    """
+    jobs = stale_jobs() if jobs is None else jobs & stale_jobs()
+    return jobs.update(
+        status=ImportJob.STATUS_FAILED,
+        error_message="Import stopped unexpectedly. Please upload the file again.",
+        finished_at=timezone.now(),
+    )
+
+
+@shared_task
+def fail_stale_import_jobs():
+    """
+    Periodic sweep (Celery beat) for jobs whose worker died mid-import.
+    """
+    return fail_stale_jobs()
+
+
+@shared_task
+def process_import_job(job_id):
+    """
+    Process a spooled CSV import in batches.
+
+    Each batch is committed on its own so progress is visible to the
+    status endpoint while the job runs.
+    """
+    claimed = ImportJob.objects.filter(
+        pk=job_id, status=ImportJob.STATUS_PENDING
+    ).update(status=ImportJob.STATUS_RUNNING, started_at=timezone.now(), heartbeat_at=timezone.now())
+    if not claimed:
+        return
+
+    job = ImportJob.objects.select_related('user').get(pk=job_id)
+
+    def on_batch(success_count, errors):
+        ImportJob.objects.filter(pk=job_id).update(
+            rows_imported=success_count,
+            rows_failed=len(errors),
+            rows_processed=success_count + len(errors),
+            heartbeat_at=timezone.now(),
+        )
+
+    try:
+        with job.file.open('rb') as fh:
+            success_count, errors = import_expenses(iter_csv_rows(fh), job.user, on_batch=on_batch)
+    except CSVHeaderError as exc:
+        mark_failed(job, str(exc))
+        return
+    except UnicodeDecodeError:
+        mark_failed(job, "CSV file must be UTF-8 encoded.")
+        return
+    except Exception:
+        mark_failed(job, "Import failed unexpectedly.")
+        raise
+
+    if errors:
+        job.error_report.save(
+            f"import_{job.pk}_errors.csv",
+            ContentFile(build_error_report(errors).encode("utf-8")),
+            save=False,
+        )
+    # Conditional, like the claim above: the job may have been failed as stale
+    # by fail_stale_jobs in the meantime, and that status must stand.
+    finished = ImportJob.objects.filter(pk=job_id, status=ImportJob.STATUS_RUNNING).update(
+        status=ImportJob.STATUS_COMPLETED,
+        error_report=job.error_report.name or "",
+        file="",
+        finished_at=timezone.now(),
+    )
+    if finished:
+        job.file.delete(save=False)
+    elif job.error_report:
+        job.error_report.delete(save=False)
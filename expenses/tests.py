@@ -1,3 +1,213 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from backend.testing import QueryCountAssertionsMixin
+from categories.models import Category
+from outbox.models import OutboxMessage
+from rollups.models import MonthlyRollup
+from .importers import import_expenses_csv
+from .models import Expense
+
+
+class ExpenseQueryCountTests(QueryCountAssertionsMixin, APITestCase):
+    """
+    Expense list, export and summary endpoints must run the same number of
+    queries for 1 expense as for 50: a difference means an N+1.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def grow(self, size):
+        """
+        Bring the user up to `size` expenses, each in its own category.
+        """
+        for index in range(Expense.objects.filter(user=self.user).count(), size):
+            category = Category.objects.create(name=f"Expense category {index}", type="expense")
+            Expense.objects.create(
+                user=self.user, title=f"Expense {index}", amount=10,
+                date=date(2025, 3, 1 + index % 28), category=category,
+            )
+
+    def test_list(self):
+        self.assertQueriesConstant("/api/expenses/", self.grow, expected=1)
+
+    def test_list_page(self):
+        self.assertQueriesConstant("/api/expenses/?page_size=100", self.grow, expected=1)
+
+    def test_export_csv(self):
+        self.assertQueriesConstant("/api/expenses/export/", self.grow, expected=1)
+
+    def test_export_ndjson(self):
+        self.assertQueriesConstant("/api/expenses/export/?output=ndjson", self.grow, expected=1)
+
+    def test_summary_by_category(self):
+        self.assertQueriesConstant("/api/expenses/summary-by-category/?month=2025-03", self.grow, expected=1)
+
+    def test_monthly_summary(self):
+        self.assertQueriesConstant("/api/expenses/monthly-summary/?from=2025-01&to=2025-03", self.grow, expected=1)
+
+    def test_income_vs_expense(self):
+        self.assertQueriesConstant("/api/expenses/summary/income-vs-expense/?from=2025-01&to=2025-03", self.grow, expected=2)
+
+
+class ExpenseBatchCreateTests(APITestCase):
+    """
+    POST /api/expenses/batch/ saves every item or none of them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        cls.food = Category.objects.create(name="Food", type="expense")
+        cls.rent = Category.objects.create(name="Rent", type="expense")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def item(self, title, amount, category, day):
+        return {"title": title, "amount": amount, "category_id": category.id, "date": day}
+
+    def test_valid_batch_is_created(self):
+        items = [
+            self.item("Groceries", "40.00", self.food, "2025-03-02"),
+            self.item("Coffee", "5.50", self.food, "2025-03-20"),
+            self.item("Rent", "900.00", self.rent, "2025-04-01"),
+        ]
+        response = self.client.post("/api/expenses/batch/", items, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual([result["status"] for result in response.data["results"]], ["created"] * 3)
+        self.assertEqual(response.data["results"][2]["expense"]["category"]["name"], "Rent")
+        self.assertEqual(
+            list(Expense.objects.filter(user=self.user).order_by("date").values_list("title", flat=True)),
+            ["Groceries", "Coffee", "Rent"],
+        )
+        rollups = {
+            (rollup.category_id, rollup.month): (rollup.total, rollup.count)
+            for rollup in MonthlyRollup.objects.filter(user=self.user, kind=MonthlyRollup.KIND_EXPENSE)
+        }
+        self.assertEqual(rollups, {
+            (self.food.id, date(2025, 3, 1)): (Decimal("45.50"), 2),
+            (self.rent.id, date(2025, 4, 1)): (Decimal("900.00"), 1),
+        })
+        # One budget check per (category, month), not per expense.
+        self.assertEqual(OutboxMessage.objects.filter(task="budgets.tasks.evaluate_budget_thresholds").count(), 2)
+
+    def test_invalid_item_rejects_the_whole_batch(self):
+        items = [
+            self.item("Groceries", "40.00", self.food, "2025-03-02"),
+            self.item("Refund", "-5.00", self.food, "2025-03-03"),
+            {"title": "No category", "amount": "10.00", "date": "2025-03-04"},
+        ]
+        response = self.client.post("/api/expenses/batch/", items, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["created"], 0)
+        results = response.data["results"]
+        self.assertEqual([result["status"] for result in results], ["skipped", "invalid", "invalid"])
+        self.assertIn("amount", results[1]["errors"])
+        self.assertIn("category_id", results[2]["errors"])
+        self.assertFalse(Expense.objects.filter(user=self.user).exists())
+        self.assertFalse(MonthlyRollup.objects.filter(user=self.user, count__gt=0).exists())
+
+    @override_settings(EXPENSE_BATCH_MAX_SIZE=2)
+    def test_batch_larger_than_the_limit_is_rejected(self):
+        items = [self.item(f"Expense {index}", "1.00", self.food, "2025-03-02") for index in range(3)]
+        response = self.client.post("/api/expenses/batch/", items, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("At most 2 expenses", response.data["error"])
+        self.assertFalse(Expense.objects.filter(user=self.user).exists())
+
+
+class ExpenseExportTests(APITestCase):
+    """
+    GET /api/expenses/export/ streams the user's expenses, oldest first, as
+    CSV or NDJSON; the CSV can be uploaded again.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+        cls.other = User.objects.create_user(username="other", email="other@example.com", password="password")
+        cls.food = Category.objects.create(name="Food", type="expense")
+        cls.rent = Category.objects.create(name="Rent", type="expense")
+        for title, amount, category, day, notes in (
+            ("Rent", "12000.00", cls.rent, date(2025, 3, 1), None),
+            ("Dinner, with friends", "1234.50", cls.food, date(2025, 3, 15), 'said "thanks"'),
+            ("Coffee", "3.00", cls.food, date(2025, 2, 28), ""),
+        ):
+            Expense.objects.create(
+                user=cls.user, title=title, amount=Decimal(amount), category=category, date=day, notes=notes,
+            )
+        Expense.objects.create(user=cls.other, title="Not mine", amount=1, category=cls.food, date=date(2025, 3, 2))
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def export(self, query=""):
+        response = self.client.get(f"/api/expenses/export/{query}")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content)
+
+    def test_csv(self):
+        response, content = self.export()
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="expenses.csv"', response["Content-Disposition"])
+        rows = list(csv.reader(io.StringIO(content.decode("utf-8"))))
+        self.assertEqual(rows, [
+            ["title", "amount", "date", "category", "notes"],
+            ["Coffee", "3.00", "2025-02-28", "Food", ""],
+            ["Rent", "12000.00", "2025-03-01", "Rent", ""],
+            ["Dinner, with friends", "1234.50", "2025-03-15", "Food", 'said "thanks"'],
+        ])
+
+    def test_ndjson_with_filters(self):
+        response, content = self.export(f"?output=ndjson&start=2025-03-01&end=2025-03-31&category={self.food.id}")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual([json.loads(line) for line in content.decode("utf-8").splitlines()], [
+            {"title": "Dinner, with friends", "amount": "1234.50", "date": "2025-03-15",
+             "category": "Food", "notes": 'said "thanks"'},
+        ])
+
+    def test_invalid_parameters(self):
+        for query in ("?output=xml", "?start=2025-13-01", "?end=yesterday", "?category=food"):
+            with self.subTest(query=query):
+                response = self.client.get(f"/api/expenses/export/{query}")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.data)
+
+    def test_csv_round_trip_through_import(self):
+        _, content = self.export()
+
+        success_count, errors = import_expenses_csv(io.BytesIO(content), self.other)
+
+        self.assertEqual((success_count, errors), (3, []))
+        fields = ("title", "amount", "date", "category__name", "notes")
+        exported = Expense.objects.filter(user=self.user).order_by("date").values_list(*fields)
+        imported = Expense.objects.filter(user=self.other).exclude(title="Not mine").order_by("date").values_list(*fields)
+
+        def normalise(rows):
+            # An empty notes cell is read back as "", so compare None and "" alike.
+            return [row[:4] + (row[4] or "",) for row in rows]
+
+        self.assertEqual(normalise(imported), normalise(exported))
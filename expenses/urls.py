@@ -1,6 +1,15 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ExpenseViewSet, ExpenseBulkUploadView, summary_by_category, monthly_expense_summary,income_vs_expense_summary
+from .views import (
+    ExpenseViewSet,
+    ExpenseBulkUploadView,
+    ImportJobListView,
+    ImportJobDetailView,
+    ImportJobErrorReportView,
+    summary_by_category,
+    monthly_expense_summary,
+    income_vs_expense_summary,
+)
 
 # DRF router to auto-generate URL patterns
 router = DefaultRouter()
@@ -16,4 +25,7 @@ urlpatterns = [
 
     path('', include(router.urls)),
     path('upload/bulk/', ExpenseBulkUploadView.as_view(), name='expense-bulk-upload'),
+    path('upload/jobs/', ImportJobListView.as_view(), name='expense-import-job-list'),
+    path('upload/jobs/<int:pk>/', ImportJobDetailView.as_view(), name='expense-import-job-detail'),
+    path('upload/jobs/<int:pk>/errors/', ImportJobErrorReportView.as_view(), name='expense-import-job-errors'),
 ]
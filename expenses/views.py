@@ -1,81 +1,159 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
-from .models import Expense
-from incomes.models import Income
-from .serializers import ExpenseSerializer
-import csv
-import io
+from .models import Expense, ImportJob
+from .serializers import EXPENSE_ROW_FIELDS, ExpenseSerializer, ImportJobSerializer, expense_rows
+from .importers import CSVHeaderError, import_expenses_csv, insert_expenses
+from .tasks import fail_stale_jobs, process_import_job
 from rest_framework.views import APIView
+from backend.dates import iter_months, month_window
+from backend.pagination import KeysetPagination
+from backend.bulk import BulkChangeMixin
+from backend.exports import EXPORT_COLUMNS, parse_export_params, stream_export
+from rest_framework import generics
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.db import transaction
-from categories.models import Category
-from rest_framework.decorators import api_view, permission_classes
-from datetime import datetime
-from django.db.models import Sum
+from django.http import FileResponse, Http404
+from rest_framework.decorators import action, api_view, permission_classes
 import calendar
-from dateutil.relativedelta import relativedelta
 from django.utils.timezone import now
-from budgets.models import Budget
+from budgets.tasks import schedule_budget_check
+from rollups.models import MonthlyRollup
+from rollups import services as rollups
+from outbox.services import enqueue
+from apicache.decorators import cached_response, etag_response
 from datetime import datetime
-from users.tasks import send_budget_alert_email
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+class ExpenseViewSet(BulkChangeMixin, viewsets.ModelViewSet):
     """
     ViewSet for performing CRUD operations on the Expense model.
     Only authenticated users can access and modify their own expenses.
     """
     serializer_class = ExpenseSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
         Returns a queryset of expenses belonging to the logged-in user,
-        ordered by most recent date first.
+        ordered by most recent date first. The category is joined because
+        ExpenseSerializer nests it.
         """
-        return Expense.objects.filter(user=self.request.user).order_by('-date')
+        return Expense.objects.filter(user=self.request.user).select_related('category').order_by('-date')
+
+    @etag_response('expense_list')
+    def list(self, request, *args, **kwargs):
+        """
+        Lists expenses through the lean `.values()` path (see expense_rows);
+        output matches ExpenseSerializer.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).values(*EXPENSE_ROW_FIELDS)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(expense_rows(page))
+        return Response(expense_rows(queryset))
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if not serializer.is_valid():
-            print("Validation errors:", serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        
-        expense = serializer.save(user=request.user)
-        user = request.user
-        category = expense.category
-        month = expense.date.replace(day=1)
 
-        # Check matching budget
-        try:
-            budget = Budget.objects.get(user=user, category=category, month=month)
-            total_spent = Expense.objects.filter(
-                user=user,
-                category=category,
-                date__year=month.year,
-                date__month=month.month
-            ).aggregate(total=Sum('amount'))['total'] or 0
-            
-            budget_amount = float(budget.amount)
-
-            if total_spent > budget_amount:
-                subject = "❗ Budget Overspent"
-                message = f"You have exceeded your budget for {category.name} in {month.strftime('%B')}. Limit: ₹{budget_amount}, Spent: ₹{total_spent}"
-                send_budget_alert_email.delay(user.email, subject, message)
-
-            elif total_spent >= 0.8 * budget_amount:
-                subject = "⚠️ Budget Near Limit"
-                message = f"You've spent over 80% of your {category.name} budget for {month.strftime('%B')}. Limit: ₹{budget_amount}, Spent: ₹{total_spent}"
-                send_budget_alert_email.delay(user.email, subject, message)
-
-        except Budget.DoesNotExist:
-            pass
+        # The expense and its outbox row commit together; threshold alerts
+        # are evaluated asynchronously once the outbox publishes the check.
+        with transaction.atomic():
+            expense = serializer.save(user=request.user)
+            schedule_budget_check(request.user.id, expense.category_id, expense.date)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            expense = serializer.save()
+            schedule_budget_check(self.request.user.id, expense.category_id, expense.date)
+
+    def after_bulk_update(self, request, added):
+        # Recategorised expenses can push their new category over budget.
+        for user_id, category_id, month, kind in added:
+            schedule_budget_check(user_id, category_id, month)
+
+    @action(detail=False, methods=['post'], url_path='batch')
+    def batch_create(self, request):
+        """
+        Creates many expenses from a JSON array in one request, e.g. when a
+        client syncs expenses recorded offline.
+
+        All items are validated first; if any is invalid nothing is saved and
+        the response is 400. Otherwise the expenses are inserted with one
+        bulk_create and budget thresholds are checked once per affected
+        (category, month) instead of once per expense.
+
+        Response: {"created": n, "results": [{"index": i, "status": ..., ...}]}
+        where status is "created" (with "expense"), "invalid" (with "errors")
+        or "skipped" (valid, but not saved because another item was invalid).
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response({"error": "Expected a non-empty JSON array of expenses."}, status=400)
+
+        max_size = settings.EXPENSE_BATCH_MAX_SIZE
+        if len(items) > max_size:
+            return Response({"error": f"At most {max_size} expenses can be created per request."}, status=400)
+
+        serializer = self.get_serializer(data=items, many=True)
+        if not serializer.is_valid():
+            results = [
+                {"index": index, "status": "invalid", "errors": errors} if errors
+                else {"index": index, "status": "skipped"}
+                for index, errors in enumerate(serializer.errors)
+            ]
+            return Response({"created": 0, "results": results}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            expenses = insert_expenses(
+                [Expense(user=request.user, **item) for item in serializer.validated_data],
+                request.user.id,
+            )
+            for category_id, month in {(e.category_id, e.date.replace(day=1)) for e in expenses}:
+                schedule_budget_check(request.user.id, category_id, month)
+
+        data = ExpenseSerializer(expenses, many=True).data
+        return Response({
+            "created": len(expenses),
+            "results": [
+                {"index": index, "status": "created", "expense": expense}
+                for index, expense in enumerate(data)
+            ],
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Streams the user's expenses, oldest first, as CSV (same columns as the
+        bulk upload, so the file can be re-imported) or NDJSON.
+        Query params: ?output=csv|ndjson&start=YYYY-MM-DD&end=YYYY-MM-DD&category=<id>
+        """
+        try:
+            output, filters = parse_export_params(request.query_params)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+
+        rows = (
+            Expense.objects.filter(user=request.user, **filters)
+            .order_by('date', 'id')
+            .values_list('title', 'amount', 'date', 'category__name', 'notes')
+        )
+        return stream_export(rows, EXPORT_COLUMNS, output, filename="expenses")
+
 
 
 class ExpenseBulkUploadView(APIView):
     """
     API view to handle CSV bulk upload of expenses.
+    The file is decoded as a stream and inserted in batches
+    (see EXPENSE_IMPORT_BATCH_SIZE), so memory stays flat with file size.
+
+    With ?mode=async the file is spooled to storage and imported by a
+    background job instead; the response is 202 with the job to poll.
     """
     permission_classes = [permissions.IsAuthenticated]
 
@@ -84,61 +162,96 @@ class ExpenseBulkUploadView(APIView):
         if not file or not file.name.endswith(".csv"):
             return Response({"error": "Please upload a valid CSV file."}, status=status.HTTP_400_BAD_REQUEST)
 
-        decoded_file = file.read().decode("utf-8")
-        io_string = io.StringIO(decoded_file)
-        reader = csv.DictReader(io_string)
-
-        required_fields = {"title", "amount", "date", "category"}
-        success_count = 0
-        errors = []
+        if request.query_params.get("mode") == "async":
+            return self.create_import_job(request, file)
 
-        with transaction.atomic():
-            for i, row in enumerate(reader, start=2):
-                row_errors = []
-
-                if not required_fields.issubset(row.keys()):
-                    return Response({"error": "CSV header must include title, amount, date, category"}, status=400)
-
-                title = row.get("title", "").strip()
-                amount = row.get("amount", "").strip()
-                date = row.get("date", "").strip()
-                category_name = row.get("category", "").strip()
-                notes = row.get("notes", "").strip() if "notes" in row else ""
-
-                if not title:
-                    row_errors.append("Missing title")
-                if not amount or not amount.isdigit():
-                    row_errors.append("Invalid or missing amount")
-                if not date:
-                    row_errors.append("Missing date")
-
-                try:
-                    category = Category.objects.get(name__iexact=category_name, type="expense")
-                except Category.DoesNotExist:
-                    row_errors.append(f"Category '{category_name}' not found")
-
-                if row_errors:
-                    errors.append({"row": i, "errors": row_errors})
-                    continue
-
-                Expense.objects.create(
-                    title=title,
-                    amount=int(amount),
-                    date=date,
-                    category=category,
-                    notes=notes,
-                    user=request.user
-                )
-                success_count += 1
+        try:
+            success_count, errors = import_expenses_csv(file, request.user)
+        except CSVHeaderError as exc:
+            return Response({"error": str(exc)}, status=400)
+        except UnicodeDecodeError:
+            return Response({"error": "CSV file must be UTF-8 encoded."}, status=400)
 
         return Response(
             {"success_count": success_count, "errors": errors},
             status=status.HTTP_200_OK
         )
 
+    def create_import_job(self, request, file):
+        """
+        Spool the upload and queue it, enforcing the per-user limit on
+        jobs that are still pending or running.
+        """
+        max_active = settings.EXPENSE_IMPORT_MAX_ACTIVE_JOBS
+
+        with transaction.atomic():
+            # Serialise job creation per user so the limit cannot be raced.
+            get_user_model().objects.select_for_update().filter(pk=request.user.pk).first()
+            # Jobs lost with a crashed worker would otherwise block new imports.
+            fail_stale_jobs(ImportJob.objects.filter(user=request.user))
+            active_jobs = ImportJob.objects.filter(
+                user=request.user,
+                status__in=ImportJob.ACTIVE_STATUSES,
+            ).count()
+            if active_jobs >= max_active:
+                return Response(
+                    {"error": f"You already have {active_jobs} import(s) in progress. Please wait for them to finish."},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS
+                )
+
+            job = ImportJob(user=request.user, original_name=file.name)
+            job.file.save(file.name, file, save=False)
+            job.save()
+            enqueue(process_import_job, args=[job.pk])
+
+        serializer = ImportJobSerializer(job, context={"request": request})
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
+class ImportJobListView(generics.ListAPIView):
+    """
+    Lists the authenticated user's background import jobs, newest first.
+    """
+    serializer_class = ImportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return ImportJob.objects.filter(user=self.request.user)
+
+
+class ImportJobDetailView(generics.RetrieveAPIView):
+    """
+    Reports progress of a single import job (rows processed / failed).
+    """
+    serializer_class = ImportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return ImportJob.objects.filter(user=self.request.user)
+
+
+class ImportJobErrorReportView(APIView):
+    """
+    Downloads the CSV error report of a finished import job.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        job = ImportJob.objects.filter(user=request.user, pk=pk).first()
+        if job is None or not job.error_report:
+            raise Http404
+        return FileResponse(
+            job.error_report.open('rb'),
+            as_attachment=True,
+            filename=f"import_{job.pk}_errors.csv",
+            content_type="text/csv",
+        )
+
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@etag_response('summary_by_category')
+@cached_response('summary_by_category')
 def summary_by_category(request):
     """
     Returns total expenses grouped by category for the selected month.
@@ -153,17 +266,7 @@ def summary_by_category(request):
     except ValueError:
         return Response({"error": "Invalid month format. Use YYYY-MM."}, status=400)
 
-    expenses = Expense.objects.filter(
-        user=request.user,
-        date__year=month_date.year,
-        date__month=month_date.month
-    )
-
-    summary = (
-        expenses.values("category__name")
-        .annotate(total=Sum("amount"))
-        .order_by("-total")
-    )
+    summary = rollups.category_totals(request.user, MonthlyRollup.KIND_EXPENSE, month_date)
 
     formatted = [
         {"category": item["category__name"], "total": float(item["total"])}
@@ -174,68 +277,54 @@ def summary_by_category(request):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@etag_response('monthly_expense_summary')
+@cached_response('monthly_expense_summary')
 def monthly_expense_summary(request):
     """
-    Returns total expense per month for the last 6 months.
-    Used for bar chart visualization.
+    Returns total expense per month, oldest first, for bar chart visualization.
+    Query params (optional):
+        ?months=N                  → the last N months (default 6)
+        ?from=YYYY-MM&to=YYYY-MM   → an explicit inclusive range
+    Read from the monthly rollup table; months without expenses are reported as 0.
     """
-    from django.utils.timezone import now
-    from dateutil.relativedelta import relativedelta
-
-    user = request.user
-    today = now().date()
-    summary = []
-
-    # Iterate through the last 6 months
-    for i in range(6):
-        month_date = today - relativedelta(months=i)
-        total = Expense.objects.filter(
-            user=user,
-            date__year=month_date.year,
-            date__month=month_date.month
-        ).aggregate(sum=Sum("amount"))["sum"] or 0
+    try:
+        first_month, last_month = month_window(request.query_params, now().date())
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=400)
 
-        summary.append({
-            "month": month_date.strftime("%Y-%m"),
-            "total": float(total)
-        })
+    totals_by_month = rollups.monthly_totals(request.user, MonthlyRollup.KIND_EXPENSE, first_month, last_month)
 
-    # Sort months from oldest to latest
-    summary = sorted(summary, key=lambda x: x["month"])
+    summary = [
+        {"month": month.strftime("%Y-%m"), "total": float(totals_by_month.get(month, 0))}
+        for month in iter_months(first_month, last_month)
+    ]
     return Response(summary)
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@etag_response('income_vs_expense_summary')
+@cached_response('income_vs_expense_summary')
 def income_vs_expense_summary(request):
     """
-    Returns income and expense totals per month (last 6 months) for line chart.
-    """
-    user = request.user
-    today = now().date()
-    summary = []
-
-    for i in range(6):
-        month_date = today - relativedelta(months=i)
-        month_label = calendar.month_abbr[month_date.month] + f" {month_date.year}"
-
-        income_total = Income.objects.filter(
-            user=user,
-            date__year=month_date.year,
-            date__month=month_date.month
-        ).aggregate(sum=Sum("amount"))["sum"] or 0
-
-        expense_total = Expense.objects.filter(
-            user=user,
-            date__year=month_date.year,
-            date__month=month_date.month
-        ).aggregate(sum=Sum("amount"))["sum"] or 0
-
-        summary.append({
-            "month": month_label,
-            "income": float(income_total),
-            "expense": float(expense_total),
-        })
-
-    # Sort by date ascending
-    summary = sorted(summary, key=lambda x: datetime.strptime(x["month"], "%b %Y"))
-    return Response(summary)
\ No newline at end of file
+    Returns income and expense totals per month, oldest first, for line chart.
+    Accepts the same ?months=N / ?from=YYYY-MM&to=YYYY-MM window as
+    monthly_expense_summary (default: last 6 months) and always runs two
+    grouped queries over the rollup table, whatever the window size.
+    """
+    try:
+        first_month, last_month = month_window(request.query_params, now().date())
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=400)
+
+    income_totals = rollups.monthly_totals(request.user, MonthlyRollup.KIND_INCOME, first_month, last_month)
+    expense_totals = rollups.monthly_totals(request.user, MonthlyRollup.KIND_EXPENSE, first_month, last_month)
+
+    summary = [
+        {
+            "month": calendar.month_abbr[month.month] + f" {month.year}",
+            "income": float(income_totals.get(month, 0)),
+            "expense": float(expense_totals.get(month, 0)),
+        }
+        for month in iter_months(first_month, last_month)
+    ]
+    return Response(summary)
@@ -430,7 +430,7 @@ export default function BudgetForm({
 
       setCategoryBudgets(initialBudgets);
       setExistingBudgets(existingMap);
-      setMonthlyCap(capRes.data[0]?.amount || 0);
+      setMonthlyCap(capRes.data.results[0]?.amount || 0);
     } catch (err) {
       setError("Failed to load budget data");
     } finally {
@@ -481,8 +481,8 @@ export default function BudgetForm({
     try {
       // Update or create monthly cap
       const capRes = await axiosInstance.get(`/budgets/monthlybudgets/?month=${month}-01`);
-      if (capRes.data.length > 0) {
-        await axiosInstance.put(`/budgets/monthlybudgets/${capRes.data[0].id}/`, {
+      if (capRes.data.results.length > 0) {
+        await axiosInstance.put(`/budgets/monthlybudgets/${capRes.data.results[0].id}/`, {
           amount: monthlyCap,
           month: `${month}-01`,
         });
@@ -32,6 +32,7 @@ import {
   FilterList as FilterIcon,
 } from "@mui/icons-material";
 import axiosInstance from "../services/axios";
+import { fetchAllPages } from "../services/pagination";
 import EditExpenseForm from "./EditExpenseForm";
 import dayjs from "dayjs";
 import CloseIcon from "@mui/icons-material/Close";
@@ -90,12 +91,12 @@ export default function ExpenseList() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [expensesRes, categoriesRes] = await Promise.all([
-          axiosInstance.get<Expense[]>("/expenses/"),
+        const [expensesList, categoriesRes] = await Promise.all([
+          fetchAllPages<Expense>("/expenses/?page_size=500"),
           axiosInstance.get<Category[]>("/categories/?type=expense"),
         ]);
 
-        const sortedExpenses = [...expensesRes.data].sort(
+        const sortedExpenses = [...expensesList].sort(
           (a, b) => new Date(b.date).getTime() - new Date(a.date).getTime()
         );
 
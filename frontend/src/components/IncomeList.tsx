@@ -31,6 +31,7 @@ import {
   FilterList as FilterIcon,
 } from "@mui/icons-material";
 import axiosInstance from "../services/axios";
+import { fetchAllPages } from "../services/pagination";
 import EditIncomeForm from "./EditIncomeForm";
 import dayjs from "dayjs";
 import CloseIcon from "@mui/icons-material/Close";
@@ -89,12 +90,12 @@ export default function IncomeList() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [incomesRes, categoriesRes] = await Promise.all([
-          axiosInstance.get<Income[]>("/incomes/"),
+        const [incomesList, categoriesRes] = await Promise.all([
+          fetchAllPages<Income>("/incomes/?page_size=500"),
           axiosInstance.get<Category[]>("/categories/?type=income"),
         ]);
 
-        const sortedIncomes = [...incomesRes.data].sort(
+        const sortedIncomes = [...incomesList].sort(
           (a, b) => new Date(b.date).getTime() - new Date(a.date).getTime()
         );
 
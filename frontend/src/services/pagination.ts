@@ -0,0 +1,24 @@
+import axiosInstance from "./axios";
+
+// Response shape of the paginated list endpoints (expenses, incomes, budgets, monthly budgets)
+export interface Page<T> {
+  next: string | null;
+  results: T[];
+}
+
+/**
+ * Fetches every page of a list endpoint by following its `next` links
+ * and returns all rows in order.
+ */
+export const fetchAllPages = async <T>(url: string): Promise<T[]> => {
+  const items: T[] = [];
+  let next: string | null = url;
+
+  while (next) {
+    const response: { data: Page<T> } = await axiosInstance.get<Page<T>>(next);
+    items.push(...response.data.results);
+    next = response.data.next;
+  }
+
+  return items;
+};
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from categories.models import Category  # assuming shared category table
 
@@ -18,6 +18,18 @@ class Income(models.Model):
         ordering = ['-date']
         verbose_name = "Income"
         verbose_name_plural = "Incomes"
+        # Per-user time-range queries (month summaries, salary check) seek on these.
+        indexes = [
+            models.Index(fields=['user', 'date'], name='income_user_date_idx'),
+            models.Index(fields=['user', 'category', 'date'], name='income_user_cat_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - ₹{self.amount}"
+
+    def save(self, *args, **kwargs):
+        # The rollup signals lock and read the stored row in pre_save and apply
+        # the difference in post_save; one transaction holds that lock until the
+        # rollup is updated, so concurrent edits cannot both move the old amount.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
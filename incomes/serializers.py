@@ -1,4 +1,8 @@
+from django.utils import timezone
 from rest_framework import serializers
+from categories.models import Category
+from categories.serializers import CategoryPrimaryKeyField
+from expenses.serializers import format_datetime
 from .models import Income
 
 class IncomeSerializer(serializers.ModelSerializer):
@@ -7,7 +11,11 @@ class IncomeSerializer(serializers.ModelSerializer):
     Ensures clean validation and auto-assigns the logged-in user.
     """
     category = serializers.SerializerMethodField()  # Used for frontend display
-    category_id = serializers.IntegerField(write_only=True)  # Accepts input from frontend form
+    category_id = CategoryPrimaryKeyField(
+        queryset=Category.objects.all(),
+        write_only=True,
+        source='category'
+    )  # Accepts input from frontend form
 
     class Meta:
         model = Income
@@ -29,15 +37,6 @@ class IncomeSerializer(serializers.ModelSerializer):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
 
-    def update(self, instance, validated_data):
-        """
-        Ensure category can be updated properly.
-        """
-        category_id = validated_data.pop('category_id', None)
-        if category_id:
-            instance.category_id = category_id
-        return super().update(instance, validated_data)
-
     def get_category(self, obj):
         """
         Display category as nested object {id, name}.
@@ -45,3 +44,34 @@ class IncomeSerializer(serializers.ModelSerializer):
         if obj.category:
             return {'id': obj.category.id, 'name': obj.category.name}
         return None
+
+
+# Columns fetched with .values() for the read-only list path (see income_rows).
+INCOME_ROW_FIELDS = (
+    'id', 'title', 'amount', 'category_id', 'category__name',
+    'date', 'notes', 'user_id', 'created_at',
+)
+
+
+def income_rows(rows):
+    """
+    Build IncomeSerializer-compatible output straight from `.values(*INCOME_ROW_FIELDS)`
+    rows. Read-only: writes still go through IncomeSerializer.
+    """
+    tz = timezone.get_current_timezone()
+    return [
+        {
+            'id': row['id'],
+            'title': row['title'],
+            'amount': f"{row['amount']:.2f}",
+            'category': (
+                {'id': row['category_id'], 'name': row['category__name']}
+                if row['category_id'] is not None else None
+            ),
+            'date': row['date'].isoformat(),
+            'notes': row['notes'],
+            'user': row['user_id'],
+            'created_at': format_datetime(row['created_at'], tz),
+        }
+        for row in rows
+    ]
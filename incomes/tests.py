@@ -1,3 +1,44 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from backend.testing import QueryCountAssertionsMixin
+from categories.models import Category
+from .models import Income
+
+
+class IncomeQueryCountTests(QueryCountAssertionsMixin, APITestCase):
+    """
+    Income list and summary endpoints must run the same number of queries
+    for 1 income as for 50: a difference means an N+1.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def grow(self, size):
+        """
+        Bring the user up to `size` incomes, each in its own category.
+        """
+        for index in range(Income.objects.filter(user=self.user).count(), size):
+            category = Category.objects.create(name=f"Income category {index}", type="income")
+            Income.objects.create(
+                user=self.user, title=f"Income {index}", amount=100,
+                date=date(2025, 3, 1 + index % 28), category=category,
+            )
+
+    def test_list(self):
+        self.assertQueriesConstant("/api/incomes/", self.grow, expected=1)
+
+    def test_list_page(self):
+        self.assertQueriesConstant("/api/incomes/?page_size=100", self.grow, expected=1)
+
+    def test_monthly_summary(self):
+        self.assertQueriesConstant("/api/incomes/summary/?month=2025-03", self.grow, expected=1)
@@ -1,27 +1,67 @@
 from rest_framework import viewsets, permissions, status
 from .models import Income
-from .serializers import IncomeSerializer
-from rest_framework.decorators import api_view, permission_classes
+from .serializers import INCOME_ROW_FIELDS, IncomeSerializer, income_rows
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.db.models import Sum
 from datetime import datetime
 from rest_framework.views import APIView
+from backend.dates import month_filter
+from backend.pagination import KeysetPagination
+from backend.bulk import BulkChangeMixin
+from categories.registry import get_registry
+from apicache.decorators import cached_response, etag_response
+from backend.exports import EXPORT_COLUMNS, parse_export_params, stream_export
 
 
-class IncomeViewSet(viewsets.ModelViewSet):
+class IncomeViewSet(BulkChangeMixin, viewsets.ModelViewSet):
     serializer_class = IncomeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        return Income.objects.filter(user=self.request.user).order_by('-date')
+        # IncomeSerializer.get_category reads obj.category for every row
+        return Income.objects.filter(user=self.request.user).select_related('category').order_by('-date')
+
+    @etag_response('income_list')
+    def list(self, request, *args, **kwargs):
+        """
+        Lists incomes through the lean `.values()` path (see income_rows);
+        output matches IncomeSerializer.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).values(*INCOME_ROW_FIELDS)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(income_rows(page))
+        return Response(income_rows(queryset))
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Streams the user's incomes, oldest first, as CSV or NDJSON.
+        Query params: ?output=csv|ndjson&start=YYYY-MM-DD&end=YYYY-MM-DD&category=<id>
+        """
+        try:
+            output, filters = parse_export_params(request.query_params)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+
+        rows = (
+            Income.objects.filter(user=request.user, **filters)
+            .order_by('date', 'id')
+            .values_list('title', 'amount', 'date', 'category__name', 'notes')
+        )
+        return stream_export(rows, EXPORT_COLUMNS, output, filename="incomes")
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@etag_response('monthly_income_summary')
+@cached_response('monthly_income_summary')
 def monthly_income_summary(request):
     month_str = request.query_params.get('month')
     if not month_str:
@@ -40,8 +80,7 @@ def monthly_income_summary(request):
 
     total_income = Income.objects.filter(
         user=request.user,
-        date__year=month_start.year,
-        date__month=month_start.month
+        **month_filter(month_start)
     ).aggregate(total=Sum('amount'))['total'] or 0
 
     return Response({
@@ -67,9 +106,8 @@ class SalaryCheckAPIView(APIView):
         # Filter by same month/year and category "Salary"
         salary_exists = Income.objects.filter(
             user=user,
-            category__name__iexact="Salary",
-            date__year=selected_month.year,
-            date__month=selected_month.month
+            category_id__in=get_registry().ids_named("Salary"),
+            **month_filter(selected_month)
         ).exists()
 
         return Response({"exists": salary_exists})
\ No newline at end of file
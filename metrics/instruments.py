@@ -0,0 +1,37 @@
+"""
+The application's metrics. Import the one you need and call .inc()/.observe().
+"""
+from .registry import Counter, Histogram
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP responses by method, route and status code.",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent producing an HTTP response, by method and route.",
+    ["method", "route"],
+)
+CACHE_REQUESTS = Counter(
+    "api_cache_requests_total",
+    "Response cache (X-Cache) and conditional GET (ETag) lookups by view and outcome.",
+    ["cache", "view", "outcome"],
+)
+
+TASKS = Counter(
+    "celery_tasks_total",
+    "Celery tasks run by this host's workers, by task and final state.",
+    ["task", "state"],
+)
+TASK_RUNTIME = Histogram(
+    "celery_task_runtime_seconds",
+    "Time a Celery task spent executing.",
+    ["task"],
+)
+TASK_WAIT = Histogram(
+    "celery_task_wait_seconds",
+    "Time between a Celery task being published (or its ETA) and a worker starting it.",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
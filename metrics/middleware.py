@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instruments import REQUEST_LATENCY, REQUESTS
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Counts responses and observes their latency per URL route.
+
+    The route is the URL pattern that matched (e.g. "api/expenses/<int:pk>/"),
+    not the path, so ids in URLs do not create new time series.
+    Disabled when METRICS_ENABLED is False.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else UNMATCHED_ROUTE
+        REQUEST_LATENCY.observe(duration, method=request.method, route=route)
+        REQUESTS.inc(method=request.method, route=route, status=response.status_code)
+        return response
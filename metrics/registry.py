@@ -0,0 +1,223 @@
+"""
+A small in-process metrics registry (counters and histograms) rendered in
+the Prometheus text exposition format.
+
+Each process keeps its samples in memory. When METRICS_MULTIPROC_DIR is set,
+every process also writes its samples to its own file in that directory
+(at most every METRICS_FLUSH_INTERVAL seconds, and at exit), and a scrape
+adds up the files of all processes, so one request to the metrics endpoint
+reports every gunicorn and Celery worker on the host. Like
+prometheus_client's multiprocess mode, the directory should be emptied when
+the service is (re)deployed.
+"""
+import atexit
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def get_directory():
+    return getattr(settings, "METRICS_MULTIPROC_DIR", "")
+
+
+def get_flush_interval():
+    return getattr(settings, "METRICS_FLUSH_INTERVAL", 5.0)
+
+
+class Registry:
+    """
+    Holds {(metric name, label values): [floats]} for the current process.
+
+    A counter keeps one value; a histogram keeps one count per bucket
+    (including +Inf) followed by the sum of observations. Merging samples
+    from several processes is then an element-wise sum.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # Also called in a forked child: samples inherited from the parent
+        # are already reported by the parent's own file.
+        self._pid = os.getpid()
+        self._filename = f"{self._pid}-{uuid.uuid4().hex[:8]}.json"
+        self._samples = {}
+        self._dirty = False
+        self._flusher = None
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+
+    def update(self, metric, labelvalues, increments):
+        """
+        Add each (index, amount) of `increments` to the metric's sample.
+        """
+        with self._lock:
+            if os.getpid() != self._pid:
+                self._reset()
+            values = self._samples.get((metric.name, labelvalues))
+            if values is None:
+                values = self._samples[(metric.name, labelvalues)] = [0.0] * metric.size
+            for index, amount in increments:
+                values[index] += amount
+            self._dirty = True
+            if self._flusher is None and get_directory():
+                self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+                self._flusher.start()
+
+    # --- Multi-process -----------------------------------------------------
+
+    def _flush_loop(self):
+        pid = self._pid
+        while pid == os.getpid():
+            time.sleep(get_flush_interval())
+            self.flush()
+
+    def flush(self):
+        """
+        Write this process's samples to its file in METRICS_MULTIPROC_DIR.
+        """
+        directory = get_directory()
+        with self._lock:
+            if not directory or not self._dirty or os.getpid() != self._pid:
+                return
+            rows = [[name, list(labels), values] for (name, labels), values in self._samples.items()]
+            self._dirty = False
+            filename = self._filename
+
+        path = os.path.join(directory, filename)
+        tmp_path = os.path.join(directory, f".{filename}.tmp")
+        with open(tmp_path, "w") as fp:
+            json.dump(rows, fp)
+        os.replace(tmp_path, path)  # readers never see a half-written file
+
+    def collect(self):
+        """
+        Samples of this process plus, in multi-process mode, those of every
+        other process that has written a file.
+        """
+        with self._lock:
+            if os.getpid() != self._pid:
+                self._reset()
+            merged = {key: list(values) for key, values in self._samples.items()}
+            own_filename = self._filename
+
+        directory = get_directory()
+        if directory and os.path.isdir(directory):
+            for filename in os.listdir(directory):
+                if not filename.endswith(".json") or filename == own_filename:
+                    continue
+                try:
+                    with open(os.path.join(directory, filename)) as fp:
+                        rows = json.load(fp)
+                except (OSError, ValueError):
+                    continue
+                for name, labels, values in rows:
+                    key = (name, tuple(labels))
+                    current = merged.get(key)
+                    if current is None:
+                        merged[key] = values
+                    elif len(current) == len(values):
+                        merged[key] = [a + b for a, b in zip(current, values)]
+        return merged
+
+    # --- Exposition --------------------------------------------------------
+
+    def render(self):
+        samples = self.collect()
+        by_metric = {}
+        for (name, labels), values in samples.items():
+            by_metric.setdefault(name, []).append((labels, values))
+
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, values in sorted(by_metric.get(name, [])):
+                if len(values) == metric.size:
+                    lines.extend(metric.render(dict(zip(metric.labelnames, labels)), values))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+atexit.register(REGISTRY.flush)
+
+
+def format_value(value):
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    kind = None
+    size = 1
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry
+        registry.register(self)
+
+    def labelvalues(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self.registry.update(self, self.labelvalues(labels), ((0, amount),))
+
+    def render(self, labels, values):
+        yield f"{self.name}{format_labels(labels)} {format_value(values[0])}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        self.buckets = tuple(sorted(float(bucket) for bucket in buckets)) + (math.inf,)
+        self.size = len(self.buckets) + 1  # one count per bucket, then the sum
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, **labels):
+        bucket = bisect_left(self.buckets, value)
+        self.registry.update(self, self.labelvalues(labels), ((bucket, 1), (self.size - 1, value)))
+
+    def render(self, labels, values):
+        cumulative = 0
+        for bound, count in zip(self.buckets, values):
+            cumulative += count
+            yield f"{self.name}_bucket{format_labels({**labels, 'le': format_value(bound)})} {format_value(cumulative)}"
+        yield f"{self.name}_sum{format_labels(labels)} {format_value(values[-1])}"
+        yield f"{self.name}_count{format_labels(labels)} {format_value(cumulative)}"
+
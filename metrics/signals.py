@@ -0,0 +1,49 @@
+import time
+from datetime import datetime
+
+from celery.signals import before_task_publish, task_postrun, task_prerun
+
+from .instruments import TASK_RUNTIME, TASK_WAIT, TASKS
+
+PUBLISHED_AT_HEADER = "published_at"
+
+
+@before_task_publish.connect
+def stamp_publish_time(headers=None, **kwargs):
+    # Message headers show up as attributes of task.request on the worker.
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+def _ready_at(request):
+    """
+    When the task could first have started: its publish time, or its ETA
+    for countdown/eta tasks. None when the message was not stamped.
+    """
+    published_at = getattr(request, PUBLISHED_AT_HEADER, None)
+    if published_at is None:
+        return None
+    eta = getattr(request, "eta", None)
+    if eta:
+        try:
+            eta = eta if isinstance(eta, datetime) else datetime.fromisoformat(eta)
+            return max(published_at, eta.timestamp())
+        except (TypeError, ValueError):
+            pass
+    return published_at
+
+
+@task_prerun.connect
+def start_task_timer(task=None, **kwargs):
+    task.request._metrics_started = time.perf_counter()
+    ready_at = _ready_at(task.request)
+    if ready_at is not None:
+        TASK_WAIT.observe(max(time.time() - ready_at, 0), task=task.name)
+
+
+@task_postrun.connect
+def record_task_run(task=None, state=None, **kwargs):
+    started = getattr(task.request, "_metrics_started", None)
+    if started is not None:
+        TASK_RUNTIME.observe(time.perf_counter() - started, task=task.name)
+    TASKS.inc(task=task.name, state=state or "UNKNOWN")
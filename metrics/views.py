@@ -0,0 +1,15 @@
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.views import APIView
+
+from .registry import CONTENT_TYPE, REGISTRY
+
+
+class MetricsView(APIView):
+    """
+    Request, cache and Celery task metrics in the Prometheus text format (admin only).
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'available_at', 'attempts', 'created_at', 'dead_at')
+    list_filter = ('task', ('dead_at', admin.EmptyFieldListFilter))
+    search_fields = ('task', 'dedupe_key', 'last_error')
+    readonly_fields = ('created_at',)
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from outbox.services import drain
+
+
+class Command(BaseCommand):
+    """
+    Publish outbox messages to the Celery broker, as an alternative to the
+    dispatch_outbox beat task.
+
+    Usage:
+        python manage.py run_outbox                 # loop forever
+        python manage.py run_outbox --interval 0.5
+        python manage.py run_outbox --once          # drain once and exit
+    """
+    help = "Dispatch pending outbox messages to Celery."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to sleep when the outbox is empty.")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--once", action="store_true", help="Drain due messages once and exit.")
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            sent = drain(options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Dispatched {sent} message(s)."))
+            return
+
+        self.stdout.write("Dispatching outbox messages (Ctrl+C to stop)...")
+        try:
+            while True:
+                sent = drain(options["batch_size"])
+                if sent:
+                    self.stdout.write(f"Dispatched {sent} message(s).")
+                else:
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
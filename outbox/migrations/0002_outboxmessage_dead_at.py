@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 05:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("outbox", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="outboxmessage",
+            name="outbox_due_idx",
+        ),
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="dead_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="outboxmessage",
+            index=models.Index(
+                condition=models.Q(("dead_at__isnull", True)),
+                fields=["available_at", "id"],
+                name="outbox_due_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """
+    A Celery task waiting to be published.
+
+    Rows are written in the same transaction as the change that causes them,
+    so a rolled-back request never sends anything and requests never talk to
+    the broker. The dispatcher publishes due rows and deletes them; a row that
+    still fails after OUTBOX_MAX_ATTEMPTS is kept as dead (dead_at set) for
+    inspection in the admin and is no longer dispatched.
+    """
+    task = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    # Pending rows with the same key are merged (e.g. debounced budget checks).
+    # Cleared when the dispatcher claims the row, so later requests queue a new one.
+    dedupe_key = models.CharField(max_length=200, null=True, blank=True, unique=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dead_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['available_at', 'id'], name='outbox_due_idx', condition=models.Q(dead_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task} {self.args} (attempts={self.attempts})"
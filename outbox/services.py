@@ -0,0 +1,131 @@
+from datetime import timedelta
+
+from celery import current_app
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+MAX_RETRY_DELAY = 300
+
+
+def get_max_attempts():
+    return getattr(settings, "OUTBOX_MAX_ATTEMPTS", 10)
+
+
+def enqueue(task, args=(), kwargs=None, delay=0, dedupe_key=None):
+    """
+    Record `task` (a Celery task or its name) to be published once the current
+    transaction commits and the dispatcher picks it up, `delay` seconds from now.
+
+    With a dedupe_key, a pending message with the same key absorbs this one,
+    so a burst of identical requests is published once.
+    """
+    message = OutboxMessage(
+        task=getattr(task, "name", task),
+        args=list(args),
+        kwargs=kwargs or {},
+        available_at=timezone.now() + timedelta(seconds=delay),
+        dedupe_key=dedupe_key,
+    )
+    if dedupe_key is None:
+        message.save()
+        return message
+
+    try:
+        with transaction.atomic():
+            message.save()
+    except IntegrityError:
+        return OutboxMessage.objects.filter(dedupe_key=dedupe_key).first()
+    return message
+
+
+def publish(messages):
+    """
+    Publish messages of one task: as one call per message, or, for a task in
+    OUTBOX_MERGE_TASKS, as a single call whose only argument is the
+    concatenation of every message's list argument.
+    """
+    task = current_app.tasks[messages[0].task]
+    if len(messages) == 1:
+        task.apply_async(args=messages[0].args, kwargs=messages[0].kwargs)
+    else:
+        task.apply_async(args=[[item for message in messages for item in message.args[0]]])
+
+
+def group_messages(batch):
+    """
+    Split a batch into publish() groups: all messages of a mergeable task
+    together, every other message on its own.
+    """
+    mergeable = set(getattr(settings, "OUTBOX_MERGE_TASKS", ()))
+    merged = {}
+    groups = []
+    for message in batch:
+        if message.task not in mergeable:
+            groups.append([message])
+        elif message.task in merged:
+            merged[message.task].append(message)
+        else:
+            merged[message.task] = [message]
+            groups.append(merged[message.task])
+    return groups
+
+
+def dispatch(batch_size=None):
+    """
+    Publish one batch of due messages and delete them. Returns the number sent.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+    dispatchers can run side by side without publishing a row twice. Claiming
+    clears the rows' dedupe_key: once a message may have been published,
+    enqueue() must create a new one instead of merging into it. Delivery is
+    at-least-once: a crash between publishing and committing the delete
+    republishes the batch. Failed rows are retried with exponential backoff
+    and marked dead after OUTBOX_MAX_ATTEMPTS attempts.
+    """
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 100)
+    max_attempts = get_max_attempts()
+    now = timezone.now()
+
+    with transaction.atomic():
+        batch = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(available_at__lte=now, dead_at__isnull=True)
+            .order_by('available_at', 'id')[:batch_size]
+        )
+        OutboxMessage.objects.filter(
+            pk__in=[message.pk for message in batch], dedupe_key__isnull=False,
+        ).update(dedupe_key=None)
+        sent = []
+        for group in group_messages(batch):
+            try:
+                publish(group)
+            except Exception as exc:
+                for message in group:
+                    message.attempts += 1
+                    message.last_error = repr(exc)
+                    if message.attempts >= max_attempts:
+                        message.dead_at = now
+                    else:
+                        message.available_at = now + timedelta(seconds=min(2 ** message.attempts, MAX_RETRY_DELAY))
+                    message.save(update_fields=['attempts', 'last_error', 'available_at', 'dead_at'])
+            else:
+                sent.extend(message.pk for message in group)
+        OutboxMessage.objects.filter(pk__in=sent).delete()
+
+    return len(sent)
+
+
+def drain(batch_size=None):
+    """
+    Dispatch batches until no due message is left. Returns the number sent.
+    """
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 100)
+    total = 0
+    while True:
+        sent = dispatch(batch_size)
+        total += sent
+        if sent < batch_size:
+            return total
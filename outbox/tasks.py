@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from .services import drain
+
+
+@shared_task
+def dispatch_outbox():
+    """
+    Publish every due outbox message. Run by Celery beat every
+    OUTBOX_DISPATCH_INTERVAL seconds (or use `manage.py run_outbox`).
+    """
+    return drain()
@@ -0,0 +1,85 @@
+import cProfile
+import threading
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from . import services
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a request sent with ?_profile=1 by a staff or admin-role user:
+    a cProfile call tree and a tracemalloc allocation summary are stored in
+    the cache, and the response carries X-Profile-Id / X-Profile-Url headers
+    pointing at GET /api/profiles/<id>/.
+
+    Other requests only pay for a substring test on the raw query string;
+    authentication is only attempted when the parameter is present. One
+    request per process is profiled at a time (cProfile and tracemalloc
+    are process-wide). For streaming responses only the work done before
+    the first byte is covered. Disabled when PROFILING_ENABLED is False.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if services.PROFILE_PARAM not in request.META.get("QUERY_STRING", ""):
+            return self.get_response(request)
+
+        if request.GET.get(services.PROFILE_PARAM) in (None, "", "0"):
+            return self.get_response(request)
+        user = self.authenticate(request)
+        if not services.can_profile(user) or not self.lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            return self.profile(request, user)
+        finally:
+            self.lock.release()
+
+    def authenticate(self, request):
+        """
+        The API authenticates in the view (JWT), after middleware runs, so
+        check the bearer token here; fall back to the session user (admin site).
+        """
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        if result is not None:
+            return result[0]
+        return getattr(request, "user", None)
+
+    def profile(self, request, user):
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - started
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if not was_tracing:
+                tracemalloc.stop()
+
+        report = services.build_report(request, response, user, profiler, duration, snapshot, peak)
+        services.save_report(report)
+        response["X-Profile-Id"] = report["id"]
+        response["X-Profile-Url"] = reverse("profile-detail", args=[report["id"]])
+        return response
@@ -0,0 +1,190 @@
+import os
+import pstats
+import sys
+import tracemalloc
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+PROFILE_PARAM = "_profile"
+
+# Call tree limits: branches under MIN_PERCENT of the request's time are cut,
+# and the tree never exceeds MAX_DEPTH levels or MAX_NODES nodes.
+MIN_PERCENT = 0.5
+MAX_DEPTH = 60
+MAX_NODES = 2000
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 25
+
+
+def can_profile(user):
+    """
+    Staff users and users with the "admin" role may profile their requests.
+    """
+    if user is None or not user.is_authenticated:
+        return False
+    return user.is_staff or getattr(user, "role", None) == "admin"
+
+
+def get_timeout():
+    return getattr(settings, "PROFILE_REPORT_TIMEOUT", 3600)
+
+
+def report_key(profile_id):
+    return f"profiling:report:{profile_id}"
+
+
+def save_report(report):
+    cache.set(report_key(report["id"]), report, get_timeout())
+
+
+def load_report(profile_id):
+    return cache.get(report_key(profile_id))
+
+
+# --- cProfile ----------------------------------------------------------------
+
+def _short_path(filename):
+    for prefix in sorted({str(settings.BASE_DIR), *sys.path}, key=len, reverse=True):
+        if prefix and filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+
+def _label(func):
+    filename, line, name = func
+    if filename == "~":  # built-in, e.g. "<method 'execute' of 'sqlite3.Cursor' objects>"
+        return name
+    return f"{name} ({_short_path(filename)}:{line})"
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def build_call_tree(stats):
+    """
+    Turn pstats data into a nested call tree, pyinstrument style.
+
+    cProfile records caller -> callee edges rather than whole stacks, so a
+    child's time is its time when called from that parent anywhere in the
+    request, not only under this branch: good for finding hot paths, not
+    exact for functions reached through several of them.
+    """
+    children = {}
+    roots = []
+    for func, (_, calls, own, cumulative, callers) in stats.items():
+        if not callers:
+            roots.append((func, calls, own, cumulative))
+        for caller, (_, edge_calls, edge_own, edge_cumulative) in callers.items():
+            children.setdefault(caller, []).append((func, edge_calls, edge_own, edge_cumulative))
+
+    total = sum(cumulative for _, _, _, cumulative in roots)
+    min_time = total * MIN_PERCENT / 100
+    budget = [MAX_NODES]
+
+    def build(func, calls, own, cumulative, path):
+        budget[0] -= 1
+        node = {
+            "function": _label(func),
+            "calls": calls,
+            "cumulative_ms": _ms(cumulative),
+            "own_ms": _ms(own),
+            "children": [],
+        }
+        if len(path) >= MAX_DEPTH:
+            return node
+        for child in sorted(children.get(func, ()), key=lambda edge: edge[3], reverse=True):
+            if child[3] < min_time or child[0] in path or budget[0] <= 0:
+                continue
+            node["children"].append(build(*child, path | {child[0]}))
+        return node
+
+    roots.sort(key=lambda root: root[3], reverse=True)
+    return [build(*root, {root[0]}) for root in roots if root[3] >= min_time]
+
+
+def top_functions(stats, limit=TOP_FUNCTIONS):
+    rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [
+        {
+            "function": _label(func),
+            "calls": calls,
+            "own_ms": _ms(own),
+            "cumulative_ms": _ms(cumulative),
+        }
+        for func, (_, calls, own, cumulative, _) in rows
+    ]
+
+
+# --- tracemalloc -------------------------------------------------------------
+
+def allocation_summary(snapshot, peak, limit=TOP_ALLOCATIONS):
+    """
+    Memory still allocated when the response was returned, grouped by the
+    line that allocated it, plus the peak traced size during the request.
+    """
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+    statistics = snapshot.statistics("lineno")
+    return {
+        "peak_kb": round(peak / 1024, 1),
+        "retained_kb": round(sum(stat.size for stat in statistics) / 1024, 1),
+        "top_lines": [
+            {
+                "location": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                "size_kb": round(stat.size / 1024, 1),
+                "count": stat.count,
+            }
+            for stat in statistics[:limit]
+        ],
+    }
+
+
+# --- Reports -----------------------------------------------------------------
+
+def build_report(request, response, user, profiler, duration, snapshot, peak):
+    stats = pstats.Stats(profiler).stats
+    return {
+        "id": uuid.uuid4().hex,
+        "created_at": timezone.now().isoformat(),
+        "user_id": user.id,
+        "method": request.method,
+        "path": request.path,
+        "query_string": request.META.get("QUERY_STRING", ""),
+        "status": response.status_code,
+        "duration_ms": _ms(duration),
+        "call_tree": build_call_tree(stats),
+        "top_functions": top_functions(stats),
+        "memory": allocation_summary(snapshot, peak),
+    }
+
+
+def render_text(report):
+    """
+    Plain-text version of a report, indented like pyinstrument's output.
+    """
+    lines = [
+        f"{report['method']} {report['path']}?{report['query_string']} -> {report['status']}"
+        f" in {report['duration_ms']} ms (profiled {report['created_at']})",
+        "",
+    ]
+
+    def walk(node, depth):
+        lines.append(f"{'  ' * depth}{node['cumulative_ms']:>10.3f} ms  {node['function']}  [{node['calls']}x]")
+        for child in node["children"]:
+            walk(child, depth + 1)
+
+    for root in report["call_tree"]:
+        walk(root, 0)
+
+    memory = report["memory"]
+    lines += ["", f"Memory: peak {memory['peak_kb']} KiB, retained {memory['retained_kb']} KiB"]
+    for row in memory["top_lines"]:
+        lines.append(f"{row['size_kb']:>10.1f} KiB  {row['count']:>7} blocks  {row['location']}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import ProfileDetailView
+
+urlpatterns = [
+    path('<str:profile_id>/', ProfileDetailView.as_view(), name='profile-detail'),
+]
@@ -0,0 +1,28 @@
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .services import can_profile, load_report, render_text
+
+
+class CanProfile(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return can_profile(request.user)
+
+
+class ProfileDetailView(APIView):
+    """
+    A stored ?_profile=1 report (staff and admin-role users only).
+    JSON by default; ?output=text returns an indented call tree.
+    """
+    permission_classes = [CanProfile]
+
+    def get(self, request, profile_id):
+        report = load_report(profile_id)
+        if report is None:
+            raise NotFound("Profile not found or expired.")
+        if request.query_params.get("output") == "text":
+            return HttpResponse(render_text(report), content_type="text/plain; charset=utf-8")
+        return Response(report)
@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import MonthlyRollup
+
+
+@admin.register(MonthlyRollup)
+class MonthlyRollupAdmin(admin.ModelAdmin):
+    """
+    Read-mostly view of the rollup table, useful when reconciling totals.
+    """
+    list_display = ('user', 'kind', 'category', 'month', 'total', 'count')
+    list_filter = ('kind', 'month')
+    search_fields = ('user__email', 'category__name')
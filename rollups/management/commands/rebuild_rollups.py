@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from apicache.services import invalidate_all, invalidate_user
+from rollups import services
+
+
+class Command(BaseCommand):
+    """
+    Rebuild or reconcile the monthly rollup table from raw Expense/Income rows.
+
+    Usage:
+        python manage.py rebuild_rollups                     # full rebuild
+        python manage.py rebuild_rollups --user 3 --user 7   # only these users
+        python manage.py rebuild_rollups --reconcile         # repair drift only
+        python manage.py rebuild_rollups --reconcile --dry-run
+    """
+    help = "Rebuild or reconcile monthly category rollups from raw expenses and incomes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", dest="users", help="Limit to a user id (repeatable).")
+        parser.add_argument("--reconcile", action="store_true", help="Only repair rows that differ from raw data.")
+        parser.add_argument("--dry-run", action="store_true", help="With --reconcile, report drift without fixing it.")
+
+    def handle(self, *args, **options):
+        users = options["users"]
+
+        if options["reconcile"]:
+            report = services.reconcile(user_ids=users, fix=not options["dry_run"])
+            drift = sum(report.values())
+            message = f"missing={report['missing']} stale={report['stale']} orphaned={report['orphaned']}"
+            if options["dry_run"]:
+                self.stdout.write(f"Drift found: {message}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Reconciled rollups ({message})."))
+            if drift and options["dry_run"]:
+                self.stdout.write(self.style.WARNING("Run without --dry-run to repair."))
+            elif drift:
+                self.invalidate_cache(users)
+            return
+
+        written = services.rebuild(user_ids=users)
+        self.invalidate_cache(users)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} rollup rows."))
+
+    def invalidate_cache(self, users):
+        # Repaired totals must not be served from the response cache.
+        if users:
+            for user_id in users:
+                invalidate_user(user_id)
+        else:
+            invalidate_all()
@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-18 04:17
+
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def populate_rollups(apps, schema_editor):
+    MonthlyRollup = apps.get_model("rollups", "MonthlyRollup")
+    sources = {
+        "expense": apps.get_model("expenses", "Expense"),
+        "income": apps.get_model("incomes", "Income"),
+    }
+    for kind, model in sources.items():
+        grouped = (
+            model.objects.annotate(month=TruncMonth("date"))
+            .order_by()
+            .values("user_id", "category_id", "month")
+            .annotate(total=Sum("amount"), count=Count("id"))
+        )
+        MonthlyRollup.objects.bulk_create(
+            [
+                MonthlyRollup(
+                    user_id=row["user_id"],
+                    category_id=row["category_id"],
+                    month=row["month"],
+                    kind=kind,
+                    total=row["total"],
+                    count=row["count"],
+                )
+                for row in grouped
+            ],
+            batch_size=1000,
+        )
+
+
+def clear_rollups(apps, schema_editor):
+    apps.get_model("rollups", "MonthlyRollup").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rollups", "0001_initial"),
+        ("expenses", "0004_expense_expense_user_date_idx_and_more"),
+        ("incomes", "0002_income_income_user_date_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_rollups, clear_rollups),
+    ]
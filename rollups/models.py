@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db import models
+
+from categories.models import Category
+
+
+class MonthlyRollup(models.Model):
+    """
+    Pre-aggregated totals of a user's expenses or incomes per category and month.
+
+    Rows are kept current incrementally (see rollups/signals.py and
+    rollups/services.py) so summary endpoints read O(categories × months)
+    rows instead of scanning every transaction.
+
+    Fields:
+        user (FK): Owner of the transactions.
+        category (FK): Category of the transactions (null for uncategorised incomes).
+        month (date): First day of the month.
+        kind (str): 'expense' or 'income'.
+        total (decimal): Sum of amounts.
+        count (int): Number of transactions.
+    """
+    KIND_EXPENSE = 'expense'
+    KIND_INCOME = 'income'
+    KIND_CHOICES = [
+        (KIND_EXPENSE, 'Expense'),
+        (KIND_INCOME, 'Income'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='monthly_rollups')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True, blank=True, related_name='monthly_rollups')
+    month = models.DateField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'category', 'month', 'kind'],
+                name='rollup_unique_key',
+                nulls_distinct=False,
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'kind', 'month'], name='rollup_user_kind_month_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} | {self.kind} | {self.category_id} | {self.month:%Y-%m} → ₹{self.total}"
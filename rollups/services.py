@@ -0,0 +1,261 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.db.models.functions import TruncMonth
+
+from backend.dates import month_start, next_month_start
+from expenses.models import Expense
+from incomes.models import Income
+from .models import MonthlyRollup
+
+SOURCE_MODELS = {
+    MonthlyRollup.KIND_EXPENSE: Expense,
+    MonthlyRollup.KIND_INCOME: Income,
+}
+
+
+def kind_for_model(model):
+    for kind, source in SOURCE_MODELS.items():
+        if issubclass(model, source):
+            return kind
+    return None
+
+
+# --- Incremental maintenance -------------------------------------------------
+
+def apply_delta(user_id, category_id, month, kind, amount, count):
+    """
+    Atomically add `amount` and `count` to one rollup row, creating it if needed.
+    Uses F() expressions so concurrent writers never lose updates.
+    """
+    if not amount and not count:
+        return
+
+    key = dict(user_id=user_id, category_id=category_id, month=month, kind=kind)
+    changes = dict(total=F('total') + amount, count=F('count') + count)
+
+    if MonthlyRollup.objects.filter(**key).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            MonthlyRollup.objects.create(total=amount, count=count, **key)
+    except IntegrityError:
+        # Another writer created the row first; fold our delta into it.
+        MonthlyRollup.objects.filter(**key).update(**changes)
+
+
+def apply_deltas(deltas):
+    """
+    Apply {(user_id, category_id, month, kind): [amount, count]} in a stable order
+    (stable ordering keeps concurrent bulk writers from deadlocking).
+    """
+    for key in sorted(deltas, key=lambda k: (k[0], k[1] or 0, k[2], k[3])):
+        amount, count = deltas[key]
+        apply_delta(*key, amount=amount, count=count)
+
+
+def record_rows(kind, rows, sign=1):
+    """
+    Fold (user_id, category_id, date, amount) rows into per-key deltas and apply them.
+    """
+    deltas = defaultdict(lambda: [Decimal('0'), 0])
+    for user_id, category_id, date, amount in rows:
+        delta = deltas[(user_id, category_id, month_start(date), kind)]
+        delta[0] += sign * Decimal(str(amount))
+        delta[1] += sign
+    apply_deltas(deltas)
+
+
+def record_instances(kind, instances, sign=1):
+    """
+    Add (sign=1) or remove (sign=-1) Expense/Income instances from the rollup,
+    e.g. after bulk_create, which does not send model signals.
+    """
+    record_rows(
+        kind,
+        ((obj.user_id, obj.category_id, obj.date, obj.amount) for obj in instances),
+        sign=sign,
+    )
+
+
+def record_queryset(kind, queryset, sign=1):
+    """
+    Add or remove every row of an Expense/Income queryset using one grouped query.
+    Call before a bulk delete (sign=-1) or around a bulk update.
+    Returns the applied {(user_id, category_id, month, kind): [amount, count]}.
+    """
+    grouped = (
+        queryset.annotate(month=TruncMonth('date'))
+        .order_by()
+        .values('user_id', 'category_id', 'month')
+        .annotate(total=Sum('amount'), count=Count('id'))
+    )
+    deltas = {
+        (row['user_id'], row['category_id'], row['month'], kind): [sign * row['total'], sign * row['count']]
+        for row in grouped
+    }
+    apply_deltas(deltas)
+    return deltas
+
+
+# --- Rebuild / reconcile -----------------------------------------------------
+
+def compute_expected(user_ids=None):
+    """
+    Aggregate raw Expense/Income rows into {(user, category, month, kind): (total, count)}.
+    """
+    expected = {}
+    for kind, model in SOURCE_MODELS.items():
+        queryset = model.objects.all()
+        if user_ids:
+            queryset = queryset.filter(user_id__in=user_ids)
+        grouped = (
+            queryset.annotate(month=TruncMonth('date'))
+            .order_by()
+            .values('user_id', 'category_id', 'month')
+            .annotate(total=Sum('amount'), count=Count('id'))
+        )
+        for row in grouped.iterator(chunk_size=2000):
+            expected[(row['user_id'], row['category_id'], row['month'], kind)] = (row['total'], row['count'])
+    return expected
+
+
+@transaction.atomic
+def rebuild(user_ids=None, batch_size=1000):
+    """
+    Recreate rollup rows from raw data. Returns the number of rows written.
+    """
+    existing = MonthlyRollup.objects.all()
+    if user_ids:
+        existing = existing.filter(user_id__in=user_ids)
+    existing.delete()
+
+    rows = [
+        MonthlyRollup(user_id=user_id, category_id=category_id, month=month, kind=kind, total=total, count=count)
+        for (user_id, category_id, month, kind), (total, count) in compute_expected(user_ids).items()
+    ]
+    MonthlyRollup.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+@transaction.atomic
+def reconcile(user_ids=None, fix=True):
+    """
+    Compare rollup rows with raw data and (optionally) repair differences.
+    Returns a dict with the number of missing, stale and orphaned rows.
+    """
+    expected = compute_expected(user_ids)
+    current = MonthlyRollup.objects.select_for_update()
+    if user_ids:
+        current = current.filter(user_id__in=user_ids)
+
+    report = {'missing': 0, 'stale': 0, 'orphaned': 0}
+    seen = set()
+    for rollup in current:
+        key = (rollup.user_id, rollup.category_id, rollup.month, rollup.kind)
+        seen.add(key)
+        total, count = expected.get(key, (Decimal('0'), 0))
+        if key not in expected:
+            if rollup.count or rollup.total:
+                report['orphaned'] += 1
+            if fix:
+                rollup.delete()
+        elif rollup.total != total or rollup.count != count:
+            report['stale'] += 1
+            if fix:
+                rollup.total, rollup.count = total, count
+                rollup.save(update_fields=['total', 'count'])
+
+    missing = [key for key in expected if key not in seen]
+    report['missing'] = len(missing)
+    if fix and missing:
+        MonthlyRollup.objects.bulk_create([
+            MonthlyRollup(
+                user_id=user_id, category_id=category_id, month=month, kind=kind,
+                total=expected[(user_id, category_id, month, kind)][0],
+                count=expected[(user_id, category_id, month, kind)][1],
+            )
+            for user_id, category_id, month, kind in missing
+        ])
+    return report
+
+
+# --- Reads -------------------------------------------------------------------
+
+def rollups_for(user, kind):
+    return MonthlyRollup.objects.filter(user=user, kind=kind)
+
+
+def month_total(user, kind, month):
+    """
+    Total amount of `kind` for the month of `month`.
+    """
+    total = rollups_for(user, kind).filter(month=month_start(month)).aggregate(total=Sum('total'))['total']
+    return total or 0
+
+
+def category_total(user, category, kind, month):
+    """
+    Total amount of `kind` in one category for the month of `month`.
+    """
+    total = (
+        rollups_for(user, kind)
+        .filter(category=category, month=month_start(month))
+        .values_list('total', flat=True)
+        .first()
+    )
+    return total or 0
+
+
+def category_totals(user, kind, month):
+    """
+    Per-category totals for one month, largest first, skipping empty categories.
+    """
+    return (
+        rollups_for(user, kind)
+        .filter(month=month_start(month), count__gt=0)
+        .values('category__name', 'total')
+        .order_by('-total')
+    )
+
+
+def monthly_totals(user, kind, first_month, last_month):
+    """
+    {month_start_date: total} for every month between first and last (inclusive) with data.
+    """
+    rows = (
+        rollups_for(user, kind)
+        .filter(month__gte=first_month, month__lt=next_month_start(last_month))
+        .order_by()
+        .values('month')
+        .annotate(total=Sum('total'))
+    )
+    return {row['month']: row['total'] for row in rows}
+
+
+def spent_subquery(kind=MonthlyRollup.KIND_EXPENSE):
+    """
+    Correlated subquery returning the rollup total for the outer row's
+    (user, category, month). Use on querysets of Budget-like models.
+    """
+    total = MonthlyRollup.objects.filter(
+        user=OuterRef('user'),
+        category=OuterRef('category'),
+        month=OuterRef('month'),
+        kind=kind,
+    ).values('total')[:1]
+    return Coalesce(
+        Subquery(total),
+        Value(Decimal('0')),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+
+
+def annotate_budget_spent(budgets):
+    """
+    Annotate a Budget queryset with `spent` for its category and month.
+    """
+    return budgets.annotate(spent=spent_subquery())
@@ -0,0 +1,93 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from categories.models import Category
+from expenses.models import Expense
+from incomes.models import Income
+from backend.dates import month_start
+from .models import MonthlyRollup
+from .services import apply_delta, kind_for_model
+
+
+def _snapshot(obj):
+    """
+    (user_id, category_id, month, amount) of an instance, normalising values
+    that were assigned as strings (e.g. Expense(date="2025-04-01")).
+    """
+    date = obj._meta.get_field('date').to_python(obj.date)
+    amount = obj._meta.get_field('amount').to_python(obj.amount)
+    return obj.user_id, obj.category_id, month_start(date), amount
+
+
+@receiver(pre_save, sender=Expense)
+@receiver(pre_save, sender=Income)
+def remember_previous_values(sender, instance, raw=False, **kwargs):
+    """
+    Capture the stored row before an update so post_save can move its amount
+    when the category, date or amount changes.
+
+    The row is locked (Expense.save / Income.save run in a transaction) so a
+    concurrent update of the same row waits and then reads our new values,
+    instead of subtracting the same old amount a second time.
+    """
+    instance._rollup_previous = None
+    if raw or instance.pk is None:
+        return
+    instance._rollup_previous = (
+        sender.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values_list('user_id', 'category_id', 'date', 'amount')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Expense)
+@receiver(post_save, sender=Income)
+def update_rollup_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    kind = kind_for_model(sender)
+    user_id, category_id, month, amount = _snapshot(instance)
+
+    previous = getattr(instance, '_rollup_previous', None)
+    instance._rollup_previous = None
+    if previous is not None:
+        prev_user_id, prev_category_id, prev_date, prev_amount = previous
+        prev_key = (prev_user_id, prev_category_id, month_start(prev_date))
+        if prev_key == (user_id, category_id, month):
+            apply_delta(user_id, category_id, month, kind, amount - prev_amount, 0)
+            return
+        apply_delta(*prev_key, kind, -prev_amount, -1)
+
+    apply_delta(user_id, category_id, month, kind, amount, 1)
+
+
+def _is_direct_delete(origin, sender):
+    """
+    True when the row itself (or a queryset of its model) was deleted, as opposed
+    to a cascade from a deleted user or category, whose rollups cascade too.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, sender)
+
+
+@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=Income)
+def update_rollup_on_delete(sender, instance, origin=None, **kwargs):
+    if origin is not None and not _is_direct_delete(origin, sender):
+        return
+    user_id, category_id, month, amount = _snapshot(instance)
+    apply_delta(user_id, category_id, month, kind_for_model(sender), -amount, -1)
+
+
+@receiver(pre_delete, sender=Category)
+def detach_income_rollups(sender, instance, **kwargs):
+    """
+    Incomes keep their rows (category SET_NULL) when a category is deleted,
+    so fold that category's income rollups into the uncategorised bucket.
+    """
+    rollups = MonthlyRollup.objects.filter(category=instance, kind=MonthlyRollup.KIND_INCOME)
+    for rollup in rollups:
+        apply_delta(rollup.user_id, None, rollup.month, rollup.kind, rollup.total, rollup.count)
+    rollups.delete()
@@ -0,0 +1,95 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from django.test import TestCase
+
+from categories.models import Category
+from expenses.models import Expense
+from incomes.models import Income
+from .models import MonthlyRollup
+
+
+class RollupConsistencyTests(TestCase):
+    """
+    After every create, update and delete the rollup rows must equal
+    SUM(amount) / COUNT(*) of the raw rows per (category, month).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="owner", email="owner@example.com", password="password"
+        )
+        cls.food = Category.objects.create(name="Food", type="expense")
+        cls.rent = Category.objects.create(name="Rent", type="expense")
+        cls.salary = Category.objects.create(name="Salary", type="income")
+        cls.bonus = Category.objects.create(name="Bonus", type="income")
+
+    def assertRollupsMatch(self, model, kind):
+        expected = {
+            (row["category_id"], row["month"]): (row["total"], row["count"])
+            for row in (
+                model.objects.filter(user=self.user)
+                .annotate(month=TruncMonth("date"))
+                .order_by()
+                .values("category_id", "month")
+                .annotate(total=Sum("amount"), count=Count("id"))
+            )
+        }
+        actual = {
+            (rollup.category_id, rollup.month): (rollup.total, rollup.count)
+            for rollup in MonthlyRollup.objects.filter(user=self.user, kind=kind)
+            if rollup.count or rollup.total
+        }
+        self.assertEqual(actual, expected)
+
+    def check_lifecycle(self, model, kind, category, other_category):
+        first = model.objects.create(
+            user=self.user, title="First", amount=Decimal("100.00"), date=date(2025, 3, 5), category=category
+        )
+        second = model.objects.create(
+            user=self.user, title="Second", amount=Decimal("40.50"), date=date(2025, 3, 20), category=category
+        )
+        self.assertRollupsMatch(model, kind)
+
+        first.amount = Decimal("120.00")
+        first.save()
+        self.assertRollupsMatch(model, kind)
+
+        first.category = other_category
+        first.save()
+        self.assertRollupsMatch(model, kind)
+
+        second.date = date(2025, 4, 1)
+        second.amount = Decimal("10.00")
+        second.save()
+        self.assertRollupsMatch(model, kind)
+
+        first.delete()
+        self.assertRollupsMatch(model, kind)
+
+        model.objects.filter(pk=second.pk).delete()
+        self.assertRollupsMatch(model, kind)
+
+    def test_expense_lifecycle(self):
+        self.check_lifecycle(Expense, MonthlyRollup.KIND_EXPENSE, self.food, self.rent)
+
+    def test_income_lifecycle(self):
+        self.check_lifecycle(Income, MonthlyRollup.KIND_INCOME, self.salary, self.bonus)
+
+    def test_update_from_stale_instance(self):
+        # Two copies of one row saved one after the other (as two concurrent
+        # requests would): the rollup follows the last write.
+        expense = Expense.objects.create(
+            user=self.user, title="Shared", amount=Decimal("50.00"), date=date(2025, 3, 5), category=self.food
+        )
+        copy = Expense.objects.get(pk=expense.pk)
+        expense.amount = Decimal("70.00")
+        expense.save()
+        copy.amount = Decimal("20.00")
+        copy.category = self.rent
+        copy.save()
+        self.assertRollupsMatch(Expense, MonthlyRollup.KIND_EXPENSE)
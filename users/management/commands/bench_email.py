@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from users.tasks import build_message, deliver
+
+LOCMEM_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+
+class Command(BaseCommand):
+    """
+    Compare one connection per email (what send_mail does) with the batched
+    delivery used by the email tasks.
+
+    Usage:
+        python manage.py bench_email --messages 2000
+        python manage.py bench_email --backend django.core.mail.backends.smtp.EmailBackend
+
+    The default locmem backend needs no mail server and shows the Python-side
+    cost and the number of connections opened; point --backend at a real SMTP
+    server to include handshake time.
+    """
+    help = "Measure email throughput with and without connection reuse."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=1000)
+        parser.add_argument("--backend", default=LOCMEM_BACKEND)
+        parser.add_argument("--to", default="bench@example.com", help="Recipient address for the test emails.")
+
+    def handle(self, *args, **options):
+        backend_class = import_string(options["backend"])
+
+        class CountingBackend(backend_class):
+            # Counts opened connections. Like send_mail, send_messages() on a
+            # closed backend opens a connection for that call only.
+            connections = 0
+            is_open = False
+
+            def open(self):
+                if not self.is_open:
+                    CountingBackend.connections += 1
+                    self.is_open = True
+                return super().open()
+
+            def close(self):
+                self.is_open = False
+                return super().close()
+
+            def send_messages(self, email_messages):
+                if self.is_open:
+                    return super().send_messages(email_messages)
+                self.open()
+                try:
+                    return super().send_messages(email_messages)
+                finally:
+                    self.close()
+
+        messages = [
+            build_message(options["to"], f"Benchmark {i}", "Expense Tracker email benchmark.")
+            for i in range(options["messages"])
+        ]
+
+        def one_by_one():
+            for message in messages:
+                CountingBackend().send_messages([message])
+
+        for label, send in (
+            ("connection per message", one_by_one),
+            ("batched", lambda: deliver(messages, connection=CountingBackend())),
+        ):
+            CountingBackend.connections = 0
+            started = time.perf_counter()
+            send()
+            elapsed = time.perf_counter() - started
+            rate = len(messages) / elapsed if elapsed else float("inf")
+            self.stdout.write(
+                f"{label:<24} {len(messages)} emails  {CountingBackend.connections} connections  "
+                f"{elapsed * 1000:.1f} ms  {rate:.0f} emails/s"
+            )
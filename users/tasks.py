@@ -1,25 +1,121 @@
 # users/tasks.py
 
+import logging
+
 from celery import shared_task
-from django.core.mail import send_mail
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from outbox.services import enqueue
+
+FROM_EMAIL = "noreply@expensetracker.com"
+EMAIL_MAX_RETRIES = 5
+MAX_RETRY_DELAY = 3600
+
+logger = logging.getLogger(__name__)
+
+
+def build_message(email, subject, message):
+    return EmailMessage(subject, message, FROM_EMAIL, [email])
+
+
+def reopen(connection):
+    """
+    Replace a connection that failed mid-batch; after a dropped connection
+    every later send on it would fail too.
+    """
+    try:
+        connection.close()
+        connection.open()
+    except Exception:
+        logger.exception("Could not reopen the email connection")
+
+
+def deliver(messages, connection=None):
+    """
+    Send EmailMessages over as few SMTP connections as possible: one per
+    EMAIL_BATCH_SIZE messages instead of one per message (send_mail opens and
+    closes a connection, including the TLS handshake, for every call).
+
+    Messages are sent one at a time on the open connection, so a refused
+    recipient or a dropped connection only fails that message.
+
+    Returns the messages that could not be sent.
+    """
+    batch_size = getattr(settings, "EMAIL_BATCH_SIZE", 100)
+    connection = connection or get_connection()
+    failed = []
+    for start in range(0, len(messages), batch_size):
+        batch = messages[start:start + batch_size]
+        try:
+            connection.open()
+        except Exception:
+            logger.exception("Could not open the email connection")
+            failed.extend(batch)
+            continue
+        try:
+            for message in batch:
+                try:
+                    if connection.send_messages([message]):
+                        continue
+                except Exception:
+                    logger.exception("Could not send email to %s", ", ".join(message.recipients()))
+                    reopen(connection)
+                failed.append(message)
+        finally:
+            connection.close()
+    return failed
+
+
+@shared_task(bind=True, max_retries=EMAIL_MAX_RETRIES)
+def send_emails(self, messages):
+    """
+    Send a batch of queued emails, each {"email": ..., "subject": ..., "message": ...},
+    over a reused connection.
+
+    The outbox dispatcher merges every pending send_emails message of a batch
+    into one call (OUTBOX_MERGE_TASKS), so a burst of OTP or budget alert
+    emails opens one connection per EMAIL_BATCH_SIZE messages. Emails that
+    could not be sent are retried on their own, with exponential backoff, up
+    to EMAIL_MAX_RETRIES times.
+    """
+    emails = [build_message(m["email"], m["subject"], m["message"]) for m in messages]
+    failed = set(deliver(emails))
+    if failed:
+        retry = [m for m, email in zip(messages, emails) if email in failed]
+        raise self.retry(args=[retry], countdown=min(60 * 2 ** self.request.retries, MAX_RETRY_DELAY))
+    return len(emails)
+
+
+def queue_email(email, subject, message):
+    """
+    Queue one email for send_emails through the outbox, in the current transaction.
+    """
+    return enqueue(send_emails, args=[[{"email": email, "subject": subject, "message": message}]])
+
+
+def otp_email(otp):
+    """
+    (subject, message) of the email-verification OTP email.
+    """
+    return "Verify Your Email - Expense Tracker", f"Your OTP for email verification is: {otp}"
+
+
+# send_otp_email and send_budget_alert_email send one email each; new emails
+# go through queue_email. They stay registered for messages queued before, and
+# hand a failed email to send_emails (through the outbox) to be retried.
 
 @shared_task
 def send_otp_email(email, otp):
     """
     Send OTP to the user's email.
     """
-    subject = "Verify Your Email - Expense Tracker"
-    message = f"Your OTP for email verification is: {otp}"
-    from_email = "noreply@expensetracker.com"
-    recipient_list = [email]
+    subject, message = otp_email(otp)
+    if deliver([build_message(email, subject, message)]):
+        queue_email(email, subject, message)
 
-    send_mail(subject, message, from_email, recipient_list)
 
 @shared_task
 def send_budget_alert_email(email, subject, message):
-    send_mail(
-        subject,
-        message,
-        "noreply@expensetracker.com",   
-        [email]
-    )
+    if deliver([build_message(email, subject, message)]):
+        queue_email(email, subject, message)
@@ -4,6 +4,7 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
+from django.db import transaction
 import logging
 import random
 
@@ -13,7 +14,7 @@ from .serializers import (
     LoginSerializer,
     EmailVerificationSerializer,  #  Added for OTP verification
 )
-from .tasks import send_otp_email  #  Celery task to send OTP
+from .tasks import otp_email, queue_email  #  OTP emails are sent by Celery via the outbox
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -30,17 +31,18 @@ class RegisterView(APIView):
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
-            # Save user with is_active=False
-            user = serializer.save(is_active=False)
+            with transaction.atomic():
+                # Save user with is_active=False
+                user = serializer.save(is_active=False)
 
-            # Generate 6-digit OTP
-            otp = str(random.randint(100000, 999999))
+                # Generate 6-digit OTP
+                otp = str(random.randint(100000, 999999))
 
-            # Store OTP in DB
-            OneTimePassword.objects.create(user=user, otp=otp)
+                # Store OTP in DB
+                OneTimePassword.objects.create(user=user, otp=otp)
 
-            # Send OTP via Celery
-            send_otp_email.delay(user.email, otp)
+                # Send OTP via Celery (published by the outbox dispatcher)
+                queue_email(user.email, *otp_email(otp))
 
             return Response(
                 {"message": "User registered successfully. OTP sent to email."},
@@ -94,15 +96,16 @@ class ResendOTPView(APIView):
         if user.is_active:
             return Response({"detail": "User is already verified."}, status=400)
 
-        # Optional: Mark previous OTPs as used
-        OneTimePassword.objects.filter(user=user, is_used=False).update(is_used=True)
+        with transaction.atomic():
+            # Optional: Mark previous OTPs as used
+            OneTimePassword.objects.filter(user=user, is_used=False).update(is_used=True)
 
-        # Generate and save new OTP
-        otp = str(random.randint(100000, 999999))
-        OneTimePassword.objects.create(user=user, otp=otp)
+            # Generate and save new OTP
+            otp = str(random.randint(100000, 999999))
+            OneTimePassword.objects.create(user=user, otp=otp)
 
-        # Send it via Celery
-        send_otp_email.delay(user.email, otp)
+            # Send it via Celery (published by the outbox dispatcher)
+            queue_email(user.email, *otp_email(otp))
 
         return Response({"message": "A new OTP has been sent to your email."}, status=200)
 